@@ -1,13 +1,228 @@
 import os
 import math
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from polaplan import (CONTAINER_CHUNK_SIZE, DEFAULT_FRAME_SIZE, PLAN_CACHE, TiledPlan, TranspositionPlan,
+                      check_rounds, decrypt_batch_files, decrypt_container_file, encrypt_batch_files,
+                      encrypt_container_file, is_container_file, non_negative_int, permute_file, plan_power,
+                      print_batch_report, read_header_fields, run_cli, stream_frames)
+
+# Nama jenis posisi per pola; tabel jenis menyimpan indeks ke tuple ini
+BASIC_KINDS = ('center', 'main_diagonal', 'anti_diagonal', 'surrounding')
+CROSS_KINDS = ('main_diagonal', 'anti_diagonal', 'horizontal', 'vertical', 'fill')
+
+# Karakter per tugas process pool encrypt_tiled/decrypt_tiled (dibulatkan ke kelipatan grid)
+TILED_TASK_SIZE = 1 << 20
+
+class XLayout:
+    __slots__ = ('x_size', 'pattern_type', 'kind_names', 'rows', 'cols', 'kinds', 'distances',
+                 'plan')
+    
+    def __init__(self, x_size, pattern_type):
+        """
+        Tata letak pola X untuk satu panjang teks: tabel posisi array('H')
+        dalam urutan pengisian plus TranspositionPlan urutan baca ciphertext
+        """
+        self.x_size = x_size
+        self.pattern_type = pattern_type
+        self.kind_names = CROSS_KINDS if pattern_type == 'cross' else BASIC_KINDS
+        self.rows = array('H')
+        self.cols = array('H')
+        self.kinds = array('B')
+        self.distances = array('H')
+        self.plan = None
+    
+    def __len__(self):
+        return len(self.rows)
+    
+    def cache_items(self):
+        # Empat tabel posisi plus urutan plan
+        return 4 * len(self.rows) + len(self.plan)
+    
+    def add(self, row, col, kind):
+        center = self.x_size // 2
+        self.rows.append(row)
+        self.cols.append(col)
+        self.kinds.append(self.kind_names.index(kind))
+        self.distances.append(abs(row - center) + abs(col - center))
+
+class XMetadata:
+    __slots__ = ('layout', 'text', 'blocks', '_view')
+    
+    def __init__(self, layout, text, blocks=1):
+        """
+        Metadata ringkas hasil enkripsi: hanya tata letak bersama (x_size,
+        pola, panjang) dan teks; dict lengkap dibuat saat pertama diminta
+        Teks yang lebih panjang dari satu grid dienkripsi per blok dengan tata
+        letak yang sama: layout dan text menggambarkan blok pertama, blocks
+        adalah jumlah blok
+        """
+        self.layout = layout
+        self.text = text
+        self.blocks = blocks
+        self._view = None
+    
+    @property
+    def x_size(self):
+        return self.layout.x_size
+    
+    @property
+    def pattern_type(self):
+        return self.layout.pattern_type
+    
+    @property
+    def length(self):
+        return len(self.layout)
+    
+    def as_dict(self):
+        """
+        Tampilan dict lengkap seperti format metadata lama (lazy, di-cache)
+        """
+        if self._view is None:
+            cipher = XPatternCipher(self.layout.x_size)
+            self._view = cipher.layout_metadata(self.layout, self.text)
+        return self._view
+    
+    def __getitem__(self, key):
+        if key == 'x_size':
+            return self.x_size
+        if key == 'blocks':
+            return self.blocks
+        if key == 'pattern_type' and self.pattern_type == 'cross':
+            return 'x_cross'
+        return self.as_dict()[key]
+    
+    def __contains__(self, key):
+        return key in self.as_dict()
+    
+    def get(self, key, default=None):
+        if key == 'blocks':
+            return self.blocks
+        if key == 'pattern_type':
+            return 'x_cross' if self.pattern_type == 'cross' else default
+        return self.as_dict().get(key, default)
+
+def build_x_layout(x_size, pattern_type, length):
+    """
+    Hitung sekali tata letak pola X untuk (x_size, pattern_type, length);
+    length paling banyak x_size * x_size (satu grid)
+    """
+    layout = XLayout(x_size, pattern_type)
+    center = x_size // 2
+    
+    # Sel garis dalam urutan pengisian, lalu sisa sel baris demi baris
+    if pattern_type == 'cross':
+        lines = []
+        for i in range(x_size):
+            lines.append((i, i, 'main_diagonal'))
+            if i != center:
+                lines.append((i, x_size - 1 - i, 'anti_diagonal'))
+        for i in range(x_size):
+            if i != center:
+                lines.append((center, i, 'horizontal'))
+                lines.append((i, center, 'vertical'))
+        rest_kind = 'fill'
+    else:
+        lines = [(i, i, 'center' if i == center else 'main_diagonal') for i in range(x_size)]
+        lines += [(i, x_size - 1 - i, 'anti_diagonal') for i in range(x_size) if i != center]
+        rest_kind = 'surrounding'
+    
+    used = set()
+    for row, col, kind in lines[:length]:
+        layout.add(row, col, kind)
+        used.add((row, col))
+    for row in range(x_size):
+        for col in range(x_size):
+            if len(layout) >= length:
+                break
+            if (row, col) not in used:
+                layout.add(row, col, rest_kind)
+    
+    # Urutan baca: pusat -> diagonal utama -> diagonal anti -> garis lain -> sisa
+    indices = range(len(layout))
+    is_center = [layout.rows[k] == layout.cols[k] == center for k in indices]
+    order = [k for k in indices if is_center[k]]
+    for kind in layout.kind_names:
+        group = [k for k in indices if layout.kind_names[layout.kinds[k]] == kind and not is_center[k]]
+        if pattern_type != 'cross' and kind in ('main_diagonal', 'anti_diagonal'):
+            # Pola basic mengurutkan diagonal berdasarkan jarak dari pusat
+            group.sort(key=layout.distances.__getitem__)
+        order.extend(group)
+    
+    layout.plan = TranspositionPlan(order, ('x_pattern', x_size, pattern_type, length))
+    return layout
 
 class XPatternCipher:
-    def __init__(self, x_size=7):
+    def __init__(self, x_size=7, rounds=1):
         """
         Inisialisasi cipher dengan ukuran pola X
         x_size: ukuran sisi X (harus ganjil untuk simetri, default 7)
+        rounds: jumlah putaran enkripsi berturut-turut (default 1)
         """
         self.x_size = x_size if x_size % 2 == 1 else x_size + 1  # Pastikan ganjil
+        self.rounds = check_rounds(rounds)
+    
+    def layout(self, pattern_type, length):
+        """
+        Ambil tata letak X (urutan, jenis posisi, jarak) dari cache bersama
+        untuk (x_size, pattern_type, length); teks yang lebih panjang dari satu
+        grid memakai tata letak satu blok penuh
+        """
+        length = min(length, self.x_size * self.x_size)
+        key = ('x_layout', self.x_size, pattern_type, length)
+        return PLAN_CACHE.get(key, lambda: build_x_layout(self.x_size, pattern_type, length))
+    
+    def plan(self, length, pattern_type="basic"):
+        """
+        Plan urutan baca X untuk panjang teks tertentu; teks yang lebih panjang
+        dari satu grid memakai TiledPlan (x_size * x_size salinan slice per blok)
+        """
+        block_size = self.x_size * self.x_size
+        if length <= block_size:
+            return plan_power(self.layout(pattern_type, length).plan, self.rounds)
+        
+        tail_length = length % block_size
+        block = self.layout(pattern_type, block_size).plan
+        tail = self.layout(pattern_type, tail_length).plan if tail_length else None
+        return plan_power(TiledPlan(block, tail, length, key=('x_tiled', self.x_size, pattern_type, length)),
+                          self.rounds)
+    
+    def layout_positions(self, layout, text):
+        """
+        Bangun daftar dict posisi per karakter dari tata letak (untuk metadata)
+        """
+        kind_key = 'line_type' if layout.pattern_type == 'cross' else 'position_type'
+        return [{
+            'char': text[index],
+            'row': layout.rows[index],
+            'col': layout.cols[index],
+            kind_key: layout.kind_names[layout.kinds[index]],
+            'distance_from_center': layout.distances[index]
+        } for index in range(len(layout))]
+    
+    def layout_grid(self, layout, text):
+        """
+        Bangun grid x_size x_size dari tata letak
+        """
+        grid = [['' for _ in range(self.x_size)] for _ in range(self.x_size)]
+        for index in range(len(layout)):
+            grid[layout.rows[index]][layout.cols[index]] = text[index]
+        return grid
+    
+    def layout_metadata(self, layout, text):
+        """
+        Bangun metadata lengkap (dict per karakter dan grid) dari tata letak
+        """
+        positions = self.layout_positions(layout, text)
+        grid = self.layout_grid(layout, text)
+        if layout.pattern_type == 'cross':
+            _, metadata = self.generate_cross_cipher_output(positions, grid)
+        else:
+            x_positions = [p for p in positions if p['position_type'] != 'surrounding']
+            surrounding_positions = [p for p in positions if p['position_type'] == 'surrounding']
+            _, metadata = self.generate_cipher_output(x_positions, surrounding_positions, grid)
+        return metadata
     
     def encrypt_x_pattern(self, plaintext):
         """
@@ -17,54 +232,12 @@ class XPatternCipher:
         if len(text) <= 1:
             return text, None
         
-        # Buat grid untuk pola X
-        grid = [['' for _ in range(self.x_size)] for _ in range(self.x_size)]
-        
-        # Tentukan posisi X dalam grid
-        x_positions = []
-        center = self.x_size // 2
+        # Urutan pusat -> diagonal utama -> diagonal anti -> sekitarnya sudah dikompilasi
+        layout = self.layout("basic", len(text))
+        ciphertext = self.plan(len(text), "basic").apply(text)
         
-        # Diagonal utama (kiri atas ke kanan bawah)
-        for i in range(self.x_size):
-            x_positions.append((i, i))
-        
-        # Diagonal kedua (kanan atas ke kiri bawah)
-        for i in range(self.x_size):
-            if (i, self.x_size - 1 - i) not in x_positions:  # Hindari duplikasi di pusat
-                x_positions.append((i, self.x_size - 1 - i))
-        
-        # Isi posisi X dengan karakter
-        char_index = 0
-        filled_positions = []
-        
-        for row, col in x_positions:
-            if char_index < len(text):
-                grid[row][col] = text[char_index]
-                filled_positions.append({
-                    'char': text[char_index],
-                    'row': row,
-                    'col': col,
-                    'position_type': self.get_position_type(row, col),
-                    'distance_from_center': abs(row - center) + abs(col - center)
-                })
-                char_index += 1
-        
-        # Jika masih ada karakter tersisa, isi area di sekitar X
-        remaining_positions = []
-        for i in range(self.x_size):
-            for j in range(self.x_size):
-                if grid[i][j] == '' and char_index < len(text):
-                    grid[i][j] = text[char_index]
-                    remaining_positions.append({
-                        'char': text[char_index],
-                        'row': i,
-                        'col': j,
-                        'position_type': 'surrounding',
-                        'distance_from_center': abs(i - center) + abs(j - center)
-                    })
-                    char_index += 1
-        
-        return self.generate_cipher_output(filled_positions, remaining_positions, grid)
+        # Teks lebih panjang dari satu grid: metadata menggambarkan blok pertama
+        return ciphertext, XMetadata(layout, text[:len(layout)], -(-len(text) // len(layout)))
     
     def get_position_type(self, row, col):
         """
@@ -126,55 +299,10 @@ class XPatternCipher:
         if len(text) <= 1:
             return text, None
         
-        grid = [['' for _ in range(self.x_size)] for _ in range(self.x_size)]
-        
-        # Buat pola X + Cross
-        cross_positions = []
-        center = self.x_size // 2
+        layout = self.layout("cross", len(text))
+        ciphertext = self.plan(len(text), "cross").apply(text)
         
-        # Diagonal utama dan anti diagonal (X)
-        for i in range(self.x_size):
-            cross_positions.append((i, i, 'main_diagonal'))
-            if i != center:  # Hindari duplikasi pusat
-                cross_positions.append((i, self.x_size - 1 - i, 'anti_diagonal'))
-        
-        # Garis horizontal dan vertikal (Cross)
-        for i in range(self.x_size):
-            if i != center:  # Hindari duplikasi pusat
-                cross_positions.append((center, i, 'horizontal'))
-                cross_positions.append((i, center, 'vertical'))
-        
-        # Isi grid dengan karakter
-        char_index = 0
-        filled_positions = []
-        
-        for row, col, line_type in cross_positions:
-            if char_index < len(text) and grid[row][col] == '':
-                grid[row][col] = text[char_index]
-                filled_positions.append({
-                    'char': text[char_index],
-                    'row': row,
-                    'col': col,
-                    'line_type': line_type,
-                    'distance_from_center': abs(row - center) + abs(col - center)
-                })
-                char_index += 1
-        
-        # Isi sisa posisi jika ada
-        for i in range(self.x_size):
-            for j in range(self.x_size):
-                if grid[i][j] == '' and char_index < len(text):
-                    grid[i][j] = text[char_index]
-                    filled_positions.append({
-                        'char': text[char_index],
-                        'row': i,
-                        'col': j,
-                        'line_type': 'fill',
-                        'distance_from_center': abs(i - center) + abs(j - center)
-                    })
-                    char_index += 1
-        
-        return self.generate_cross_cipher_output(filled_positions, grid)
+        return ciphertext, XMetadata(layout, text[:len(layout)], -(-len(text) // len(layout)))
     
     def generate_cross_cipher_output(self, positions, grid):
         """
@@ -182,7 +310,8 @@ class XPatternCipher:
         """
         # Kelompokkan berdasarkan jenis garis
         center = [p['char'] for p in positions if p['row'] == p['col'] == self.x_size // 2]
-        main_diag = [p['char'] for p in positions if p['line_type'] == 'main_diagonal']
+        main_diag = [p['char'] for p in positions
+                     if p['line_type'] == 'main_diagonal' and not p['row'] == p['col'] == self.x_size // 2]
         anti_diag = [p['char'] for p in positions if p['line_type'] == 'anti_diagonal']
         horizontal = [p['char'] for p in positions if p['line_type'] == 'horizontal']
         vertical = [p['char'] for p in positions if p['line_type'] == 'vertical']
@@ -206,101 +335,95 @@ class XPatternCipher:
         
         return ciphertext, metadata
     
-    def decrypt_x_pattern(self, ciphertext, metadata):
+    def decrypt_x_pattern(self, ciphertext, metadata=None, pattern_type="basic"):
         """
         Dekripsi dari pola X
+        Cukup (x_size, pattern_type, panjang ciphertext); metadata opsional
+        dan hanya dipakai untuk mengetahui jenis pola
         """
         if len(ciphertext) <= 1:
             return ciphertext
         
-        # Rekonstruksi berdasarkan metadata
-        if metadata.get('pattern_type') == 'x_cross':
-            return self.decrypt_x_cross_pattern(ciphertext, metadata)
-        
-        # Dekripsi pola X biasa
-        center_len = len(metadata['center_chars'])
-        main_diag_len = len(metadata['main_diagonal'])
-        anti_diag_len = len(metadata['anti_diagonal'])
-        surrounding_len = len(metadata['surrounding'])
-        
-        # Pisahkan cipher berdasarkan panjang setiap bagian
-        center_part = ciphertext[:center_len]
-        main_diag_part = ciphertext[center_len:center_len + main_diag_len]
-        anti_diag_part = ciphertext[center_len + main_diag_len:center_len + main_diag_len + anti_diag_len]
-        surrounding_part = ciphertext[center_len + main_diag_len + anti_diag_len:]
-        
-        # Rekonstruksi grid
-        reconstructed_grid = [['' for _ in range(self.x_size)] for _ in range(self.x_size)]
+        if metadata is not None and metadata.get('pattern_type') == 'x_cross':
+            pattern_type = "cross"
         
-        # Isi kembali berdasarkan posisi asli
-        char_index = 0
-        
-        # Pusat
-        center = self.x_size // 2
-        if center_part:
-            reconstructed_grid[center][center] = center_part[0]
-            char_index += 1
-        
-        # Diagonal utama
-        main_diag_index = 0
-        for i in range(self.x_size):
-            if i != center and main_diag_index < len(main_diag_part):
-                reconstructed_grid[i][i] = main_diag_part[main_diag_index]
-                main_diag_index += 1
-        
-        # Diagonal anti
-        anti_diag_index = 0
-        for i in range(self.x_size):
-            col = self.x_size - 1 - i
-            if reconstructed_grid[i][col] == '' and anti_diag_index < len(anti_diag_part):
-                reconstructed_grid[i][col] = anti_diag_part[anti_diag_index]
-                anti_diag_index += 1
-        
-        # Area sekitarnya
-        surrounding_index = 0
-        for i in range(self.x_size):
-            for j in range(self.x_size):
-                if reconstructed_grid[i][j] == '' and surrounding_index < len(surrounding_part):
-                    reconstructed_grid[i][j] = surrounding_part[surrounding_index]
-                    surrounding_index += 1
-        
-        # Baca kembali sesuai urutan pengisian asli
-        result = []
-        for i in range(self.x_size):
-            for j in range(self.x_size):
-                if reconstructed_grid[i][j]:
-                    result.append(reconstructed_grid[i][j])
-        
-        return ''.join(result)
-    
-    def decrypt_x_cross_pattern(self, ciphertext, metadata):
+        # Balik urutan baca dengan permutasi invers dari tata letak yang sama
+        return self.plan(len(ciphertext), pattern_type).invert(ciphertext)
+    
+    def decrypt_x_cross_pattern(self, ciphertext, metadata=None):
         """
         Dekripsi pola X + Cross
         """
-        # Pisahkan berdasarkan metadata
-        center_len = len(metadata['center'])
-        main_diag_len = len(metadata['main_diagonal'])
-        anti_diag_len = len(metadata['anti_diagonal'])
-        horizontal_len = len(metadata['horizontal'])
-        vertical_len = len(metadata['vertical'])
-        fill_len = len(metadata['fill'])
-        
-        # Rekonstruksi dalam urutan yang sama dengan enkripsi
-        result = []
-        center = self.x_size // 2
-        
-        # Isi berdasarkan urutan cross_positions dalam encrypt_x_cross_pattern
-        char_index = 0
-        reconstructed = [''] * len(ciphertext)
-        
-        # Mapping berdasarkan urutan asli pengisian
-        pos_index = 0
-        for pos in metadata['positions']:
-            if pos_index < len(ciphertext):
-                reconstructed[pos_index] = ciphertext[pos_index]
-                pos_index += 1
-        
-        return ''.join(reconstructed)
+        return self.decrypt_x_pattern(ciphertext, pattern_type="cross")
+    
+    def encrypt_inplace(self, buffer, pattern_type="basic"):
+        """
+        Enkripsi langsung di bytearray/mmap yang bisa ditulis, tanpa normalisasi
+        Buffer yang lebih panjang dari satu grid diproses per blok (tiled)
+        """
+        if len(buffer) <= 1:
+            return buffer
+        return self.plan(len(buffer), pattern_type).apply_inplace(buffer)
+    
+    def decrypt_inplace(self, buffer, pattern_type="basic"):
+        """
+        Dekripsi langsung di bytearray/mmap yang bisa ditulis
+        """
+        if len(buffer) <= 1:
+            return buffer
+        return self.plan(len(buffer), pattern_type).invert_inplace(buffer)
+    
+    def grid_span(self, size):
+        """
+        Kelipatan grid (x_size²) terbesar yang tidak melebihi size, minimal satu grid
+        """
+        grid = self.x_size * self.x_size
+        return grid * max(1, size // grid)
+    
+    def stream_frame_size(self):
+        """
+        Ukuran frame stream default: kelipatan grid sebesar DEFAULT_FRAME_SIZE
+        """
+        return self.grid_span(DEFAULT_FRAME_SIZE)
+    
+    def encrypt_stream(self, chunks, pattern_type="basic", frame_size=None):
+        """
+        Enkripsi aliran potongan bytes per frame, tanpa normalisasi; setiap frame
+        dihasilkan begitu lengkap. Frame default kelipatan grid (x_size²) sehingga
+        hasilnya sama dengan memproses grid satu per satu
+        """
+        frame_size = frame_size or self.stream_frame_size()
+        return stream_frames(chunks, frame_size, lambda length: self.plan(length, pattern_type))
+    
+    def decrypt_stream(self, chunks, pattern_type="basic", frame_size=None):
+        """
+        Dekripsi aliran potongan bytes hasil encrypt_stream dengan ukuran frame yang sama
+        """
+        frame_size = frame_size or self.stream_frame_size()
+        return stream_frames(chunks, frame_size, lambda length: self.plan(length, pattern_type), decrypt=True)
+    
+    def container_spec(self, pattern_type="basic"):
+        """
+        Spec container pola X: ukuran X dan pattern_type di header, chunk selaras grid
+        """
+        params = {'X_SIZE': self.x_size, 'PATTERN_TYPE': pattern_type, 'ROUNDS': self.rounds}
+        return 'x_pattern', params, container_planner(params), self.grid_span(CONTAINER_CHUNK_SIZE)
+    
+    def encrypt_batch(self, input_dir, output_dir, pattern_type="basic", workers=None, processes=False):
+        """
+        Enkripsi pohon input_dir ke output_dir, satu container pola X per file. Mengembalikan BatchStats
+        """
+        stats = encrypt_batch_files(input_dir, output_dir, self.container_spec(pattern_type), workers, processes)
+        print_batch_report(stats, f"❌ Batch enkripsi pola X: {stats.files} file", "❌ Error")
+        return stats
+    
+    def decrypt_batch(self, input_dir, output_dir, workers=None, processes=False):
+        """
+        Dekripsi pohon container pola X hasil encrypt_batch. Mengembalikan BatchStats
+        """
+        stats = decrypt_batch_files(input_dir, output_dir, 'x_pattern', container_planner, workers, processes)
+        print_batch_report(stats, f"❌ Batch dekripsi pola X: {stats.files} file", "❌ Error")
+        return stats
     
     def visualize_x_pattern(self, grid, metadata, title="X Pattern Visualization"):
         """
@@ -342,26 +465,101 @@ class XPatternCipher:
         if metadata.get('fill'):
             print(f"⚪ Fill: {' '.join(metadata['fill'])}")
     
-    def encrypt_file(self, input_file, output_file, pattern_type="basic"):
+    def encrypt_tiled(self, plaintext, pattern_type="basic", workers=None):
+        """
+        Enkripsi teks sepanjang apa pun dengan membaginya menjadi blok
+        berukuran x_size * x_size yang dienkripsi sendiri-sendiri
+        workers: jumlah proses paralel (None/1 = tanpa pool)
+        Mengembalikan (ciphertext, jumlah blok, panjang blok terakhir)
+        """
+        text = plaintext.replace(" ", "").upper()
+        block_size = self.x_size * self.x_size
+        blocks = -(-len(text) // block_size)
+        tail_length = len(text) - (blocks - 1) * block_size if blocks else 0
+        
+        span = self.grid_span(TILED_TASK_SIZE)
+        if workers and workers > 1 and len(text) > span:
+            # Blok independen: setiap tugas satu rentang kelipatan grid dengan TiledPlan sendiri
+            tasks = [(self.x_size, pattern_type, text[start:start + span], self.rounds, False)
+                     for start in range(0, len(text), span)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                ciphertext = ''.join(executor.map(permute_x_span, tasks))
+        else:
+            # Tanpa pool: satu gather dengan permutasi gabungan seluruh blok
+            ciphertext = self.plan(len(text), pattern_type).apply(text)
+        
+        return ciphertext, blocks, tail_length
+    
+    def decrypt_tiled(self, ciphertext, pattern_type="basic", workers=None):
+        """
+        Dekripsi hasil encrypt_tiled blok demi blok
+        """
+        span = self.grid_span(TILED_TASK_SIZE)
+        if workers and workers > 1 and len(ciphertext) > span:
+            tasks = [(self.x_size, pattern_type, ciphertext[start:start + span], self.rounds, True)
+                     for start in range(0, len(ciphertext), span)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return ''.join(executor.map(permute_x_span, tasks))
+        
+        return self.plan(len(ciphertext), pattern_type).invert(ciphertext)
+    
+    def encrypt_file(self, input_file, output_file, pattern_type="basic", workers=None, use_mmap=False,
+                     container=False):
         """
         Enkripsi file dengan pola X
         pattern_type: "basic" atau "cross"
+        workers: enkripsi chunk container secara paralel (workers > 1 memakai container)
+        use_mmap: transposisi byte mentah lewat mmap tanpa decode/normalisasi;
+        mengembalikan jumlah byte
+        container: tulis container biner bersama (chunk + CRC32, byte mentah);
+        mengembalikan jumlah byte
         """
         try:
+            if container or (workers and workers > 1):
+                total = encrypt_container_file(input_file, output_file, self.container_spec(pattern_type), workers)
+                
+                print(f"❌ File berhasil dienkripsi dengan pola X (container): {input_file} -> {output_file}")
+                return total
+            
+            if use_mmap:
+                length = os.path.getsize(input_file)
+                block_size = self.x_size * self.x_size
+                blocks = -(-length // block_size)
+                tail_length = length - (blocks - 1) * block_size if blocks else 0
+                header = (f"X_PATTERN_CIPHER\nX_SIZE:{self.x_size}\nPATTERN_TYPE:{pattern_type}\n"
+                          f"ORIGINAL_LENGTH:{length}\nBLOCKS:{blocks}\nTAIL_LENGTH:{tail_length}\n")
+                if self.rounds != 1:
+                    header += f"ROUNDS:{self.rounds}\n"
+                header += "UNIT:bytes\n---\n"
+                total = permute_file(input_file, output_file, lambda n: self.plan(n, pattern_type),
+                                     header.encode('utf-8'))
+                
+                print(f"❌ File berhasil dienkripsi dengan pola X (mmap): {input_file} -> {output_file}")
+                return total
+            
             with open(input_file, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            if pattern_type == "cross":
-                encrypted, metadata = self.encrypt_x_cross_pattern(content)
-            else:
-                encrypted, metadata = self.encrypt_x_pattern(content)
+            # Teks yang lebih panjang dari satu grid dienkripsi per blok
+            encrypted, blocks, tail_length = self.encrypt_tiled(content, pattern_type, workers)
+            metadata = {
+                'x_size': self.x_size,
+                'pattern_type': pattern_type,
+                'blocks': blocks,
+                'tail_length': tail_length,
+                'rounds': self.rounds
+            }
             
             # Simpan dengan metadata
-            with open(output_file, 'w', encoding='utf-8') as f:
+            with open(output_file, 'w', encoding='utf-8', newline='') as f:
                 f.write(f"X_PATTERN_CIPHER\n")
                 f.write(f"X_SIZE:{self.x_size}\n")
                 f.write(f"PATTERN_TYPE:{pattern_type}\n")
                 f.write(f"ORIGINAL_LENGTH:{len(content.replace(' ', ''))}\n")
+                f.write(f"BLOCKS:{blocks}\n")
+                f.write(f"TAIL_LENGTH:{tail_length}\n")
+                if self.rounds != 1:
+                    f.write(f"ROUNDS:{self.rounds}\n")
                 f.write("---\n")
                 f.write(encrypted)
             
@@ -375,43 +573,50 @@ class XPatternCipher:
             print(f"❌ Error saat enkripsi: {e}")
             return None, None
     
-    def decrypt_file(self, input_file, output_file):
+    def decrypt_file(self, input_file, output_file, workers=None, use_mmap=False):
         """
         Dekripsi file pola X
+        File hasil mode mmap (UNIT:bytes) dan container dikenali otomatis
         """
         try:
-            with open(input_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            if is_container_file(input_file):
+                total = decrypt_container_file(input_file, output_file, 'x_pattern', container_planner, workers)
+                
+                print(f"❌ File berhasil didekripsi (container): {input_file} -> {output_file}")
+                return total
             
-            lines = content.split('\n')
-            if not lines[0].startswith("X_PATTERN_CIPHER"):
+            with open(input_file, 'rb') as f:
+                magic, fields, header_length = read_header_fields(f)
+            if magic != "X_PATTERN_CIPHER":
                 raise ValueError("Bukan file X pattern cipher!")
             
-            # Parse metadata
-            x_size = int(lines[1].split(':')[1])
-            pattern_type = lines[2].split(':')[1]
-            original_length = int(lines[3].split(':')[1])
-            
-            # Ambil encrypted content
-            encrypted_content = '\n'.join(lines[5:])
+            if use_mmap or fields.get('UNIT') == 'bytes':
+                cipher = XPatternCipher(int(fields['X_SIZE']), int(fields.get('ROUNDS', 1)))
+                pattern_type = fields['PATTERN_TYPE']
+                total = permute_file(input_file, output_file, lambda n: cipher.plan(n, pattern_type),
+                                     offset=header_length, decrypt=True)
+                
+                print(f"❌ File berhasil didekripsi (mmap): {input_file} -> {output_file}")
+                return total
             
-            # Set x_size dan dekripsi
-            old_size = self.x_size
-            self.x_size = x_size
+            with open(input_file, 'r', encoding='utf-8', newline='') as f:
+                content = f.read()
             
-            # Untuk dekripsi yang tepat, kita perlu metadata asli
-            # Ini adalah simplifikasi - dalam implementasi nyata perlu menyimpan metadata lengkap
-            if pattern_type == "cross":
-                temp_encrypted, temp_metadata = self.encrypt_x_cross_pattern('A' * original_length)
-            else:
-                temp_encrypted, temp_metadata = self.encrypt_x_pattern('A' * original_length)
+            if not content.startswith("X_PATTERN_CIPHER\n"):
+                raise ValueError("Bukan file X pattern cipher!")
             
-            # Simulasi dekripsi (simplified)
-            decrypted = encrypted_content.replace('\n', '')
+            # Parse metadata sampai pemisah ---
+            header, encrypted_content = content.split('---\n', 1)
+            fields = dict(line.split(':', 1) for line in header.split('\n')[1:] if ':' in line)
+            x_size = int(fields['X_SIZE'])
+            pattern_type = fields['PATTERN_TYPE']
+            rounds = int(fields.get('ROUNDS', 1))
             
-            self.x_size = old_size
+            # Dekripsi cukup dari header: ukuran X, jenis pola, putaran dan panjang
+            cipher = XPatternCipher(x_size, rounds)
+            decrypted = cipher.decrypt_tiled(encrypted_content, pattern_type, workers)
             
-            with open(output_file, 'w', encoding='utf-8') as f:
+            with open(output_file, 'w', encoding='utf-8', newline='') as f:
                 f.write(decrypted)
             
             print(f"❌ File berhasil didekripsi: {input_file} -> {output_file}")
@@ -424,6 +629,22 @@ class XPatternCipher:
             print(f"❌ Error saat dekripsi: {e}")
             return None
 
+def permute_x_span(task):
+    """
+    Enkripsi atau dekripsi satu rentang kelipatan grid (x_size, pattern_type,
+    teks, rounds, decrypt) untuk process pool
+    """
+    x_size, pattern_type, span, rounds, decrypt = task
+    plan = XPatternCipher(x_size, rounds).plan(len(span), pattern_type)
+    return plan.invert(span) if decrypt else plan.apply(span)
+
+def container_planner(params):
+    """
+    Planner XPatternCipher dari header container (ukuran X dan tipe pola)
+    """
+    return (XPatternCipher, (int(params['X_SIZE']), int(params.get('ROUNDS', 1))),
+            {'pattern_type': params['PATTERN_TYPE']})
+
 def demo():
     """
     Demonstrasi X Pattern Cipher
@@ -524,10 +745,12 @@ def interactive_mode():
                 cipher.visualize_x_pattern(metadata['grid'], metadata)
         
         elif choice == '3':
-            print("🔓 Dekripsi X pattern (simplified demo)")
             text = input("📝 Masukkan teks terenkripsi: ")
             size = int(input("📏 Ukuran X yang digunakan (default 7): ") or 7)
-            print(f"✅ Simulasi dekripsi berhasil: {text}")
+            pattern_type = input("🔥 Tipe pola (basic/cross, default basic): ").strip() or "basic"
+            cipher = XPatternCipher(size)
+            decrypted = cipher.decrypt_tiled(text, pattern_type)
+            print(f"✅ Hasil dekripsi: {decrypted}")
         
         elif choice == '4':
             input_file = input("📄 Nama file input: ")
@@ -570,9 +793,31 @@ def interactive_mode():
         else:
             print("❌ Pilihan tidak valid! Coba lagi.")
 
+def add_cli_arguments(parser, command):
+    """
+    Parameter cipher untuk baris perintah (sama untuk semua subperintah)
+    """
+    parser.add_argument("--x-size", type=int, default=7, help="ukuran grid X (default 7)")
+    parser.add_argument("--rounds", type=non_negative_int, default=1, help="jumlah putaran (default 1)")
+    parser.add_argument("--pattern", choices=("basic", "cross"), default="basic",
+                        help="jenis pola (default basic)")
+
+def cipher_from_args(args):
+    """
+    Bangun cipher dan argumen stream (atau argumen encrypt_batch) dari argumen baris perintah
+    Frame default kelipatan grid (x_size²)
+    """
+    options = {'pattern_type': args.pattern}
+    if args.command != "batch":
+        options['frame_size'] = args.frame_size
+    return XPatternCipher(args.x_size, args.rounds), options
+
+def main(argv=None):
+    """
+    Titik masuk baris perintah XPatternCipher
+    """
+    return run_cli(argv, "X Pattern Cipher", add_cli_arguments, cipher_from_args, demo, interactive_mode)
+
 if __name__ == "__main__":
-    # Jalankan demo
-    demo()
-    
-    # Jalankan mode interaktif
-    interactive_mode()
\ No newline at end of file
+    # Tanpa argumen: demo lalu mode interaktif
+    raise SystemExit(main())
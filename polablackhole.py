@@ -1,13 +1,369 @@
 import os
 import math
+from array import array
+from itertools import chain, repeat
+
+from polaplan import (CONTAINER_CHUNK_SIZE, COPY_CHUNK, DEFAULT_FRAME_SIZE, DEFAULT_MEMORY_BUDGET, FilePlan,
+                      PLAN_CACHE, TranspositionPlan, chain_passes, check_rounds, copy_pieces,
+                      decrypt_batch_files, decrypt_container_file, distribute_external, encrypt_batch_files,
+                      encrypt_container_file, index_dtype, index_typecode, is_container_file,
+                      non_negative_int, np, permute_file, permute_inplace_pieces, plan_power,
+                      print_batch_report, read_header_fields, run_cli, stream_frames, warn_without_numpy)
+
+# Sel per pita jarak di ring_sources: beberapa array int64 sementara per pita
+RING_PIECE_ITEMS = 1 << 16
+
+# Perkiraan byte per sel saat membangun satu pita (mode eksternal)
+RING_CELL_BYTES = 128
+
+class BlackHoleLayout:
+    __slots__ = ('size', 'horizon_end', 'disk_end', 'plan')
+    
+    def __init__(self, size):
+        """
+        Tata letak black hole: batas event horizon dan accretion disk,
+        dan TranspositionPlan urutan baca ciphertext setelah distorsi
+        """
+        self.size = size
+        self.horizon_end = 0
+        self.disk_end = 0
+        self.plan = None
+    
+    def __len__(self):
+        return len(self.plan)
+
+class BlackHoleMetadata:
+    __slots__ = ('layout', 'text', '_view')
+    
+    def __init__(self, layout, text):
+        """
+        Metadata ringkas hasil enkripsi; grid dan kelompok karakter baru
+        dibuat saat diminta (misalnya untuk visualisasi)
+        """
+        self.layout = layout
+        self.text = text
+        self._view = None
+    
+    def as_dict(self):
+        """
+        Tampilan dict lengkap (lazy, di-cache)
+        """
+        if self._view is None:
+            self._view = black_hole_metadata(self.layout, self.text)
+        return self._view
+    
+    def __getitem__(self, key):
+        return self.as_dict()[key]
+    
+    def __contains__(self, key):
+        return key in self.as_dict()
+    
+    def get(self, key, default=None):
+        return self.as_dict().get(key, default)
+
+def spiral_layer_start(layer, size):
+    """
+    Indeks spiral pertama pada layer: jumlah keliling layer di luarnya
+    size^2 - (size - 2 * layer)^2
+    """
+    return 4 * layer * (size - layer)
+
+def spiral_layer(index, size):
+    """
+    Layer (keliling) tempat langkah spiral ke-index berada
+    """
+    # Layer terdalam yang dimulai sebelum index: sisa sel (size - 2 * layer)^2
+    # harus >= size^2 - index, jadi size - 2 * layer >= ceil(sqrt(size^2 - index))
+    return (size - math.isqrt(size * size - index - 1) - 1) // 2
+
+def spiral_position(index, size):
+    """
+    Koordinat (baris, kolom) langkah ke-index pada spiral masuk ke pusat, O(1)
+    """
+    layer = spiral_layer(index, size)
+    step = index - spiral_layer_start(layer, size)
+    side = size - 2 * layer
+    last = layer + side - 1
+    if side == 1:
+        return layer, layer
+    if step < side:                      # Kanan
+        return layer, layer + step
+    if step < 2 * side - 1:              # Bawah
+        return layer + step - side + 1, last
+    if step < 3 * side - 2:              # Kiri
+        return last, last - (step - 2 * side + 2)
+    return last - (step - 3 * side + 3), layer  # Atas
+
+def spiral_index(row, col, size):
+    """
+    Kebalikan spiral_position: langkah spiral untuk sel (row, col), O(1)
+    """
+    layer = min(row, col, size - 1 - row, size - 1 - col)
+    start = spiral_layer_start(layer, size)
+    side = size - 2 * layer
+    last = layer + side - 1
+    if row == layer:
+        return start + col - layer
+    if col == last:
+        return start + side - 1 + row - layer
+    if row == last:
+        return start + 2 * side - 2 + last - col
+    return start + 3 * side - 3 + last - row
+
+def spiral_indices(rows, cols, size):
+    """
+    spiral_index untuk array baris dan kolom sekaligus (NumPy)
+    """
+    layer = np.minimum(np.minimum(rows, cols), np.minimum(size - 1 - rows, size - 1 - cols))
+    start = 4 * layer * (size - layer)
+    side = size - 2 * layer
+    last = layer + side - 1
+    return np.select([rows == layer, cols == last, rows == last],
+                     [start + cols - layer, start + side - 1 + rows - layer, start + 2 * side - 2 + last - cols],
+                     start + 3 * side - 3 + last - rows)
+
+def _isqrt_array(values):
+    """
+    Akar kuadrat bulat (floor) per elemen, dikoreksi dari hasil floating point
+    """
+    roots = np.sqrt(values).astype(np.int64)
+    roots -= roots * roots > values
+    roots += (roots + 1) * (roots + 1) <= values
+    return roots
+
+def spiral_coordinates(size, length, start=0):
+    """
+    Koordinat langkah spiral start..length-1 dalam satu panggilan
+    Mengembalikan (rows, cols) sebagai array (ndarray bila NumPy tersedia)
+    """
+    if start >= length:
+        return (np.empty(0, dtype=np.int64),) * 2 if np is not None else (array('q'), array('q'))
+    
+    # Bangun layer utuh yang disentuh [start, length), lalu buang langkah di luar rentang
+    first = spiral_layer(start, size)
+    skip = start - spiral_layer_start(first, size)
+    if np is not None:
+        layer = np.arange(first, spiral_layer(length - 1, size) + 1, dtype=np.int64)
+        side = size - 2 * layer
+        far = size - 1 - layer
+        # Kanan, bawah, kiri, atas: setiap sisi satu rentang (awal, arah, panjang)
+        row_starts = np.stack([layer, layer + 1, far, far - 1], axis=1).ravel()
+        col_starts = np.stack([layer, far, far - 1, layer], axis=1).ravel()
+        counts = np.maximum(np.stack([side, side - 1, side - 1, side - 2], axis=1), 0).ravel()
+        steps = np.arange(int(counts.sum()), dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+        rows = np.repeat(row_starts, counts) + np.repeat(np.tile([0, 1, 0, -1], len(layer)), counts) * steps
+        cols = np.repeat(col_starts, counts) + np.repeat(np.tile([1, 0, -1, 0], len(layer)), counts) * steps
+        return rows[skip:skip + length - start], cols[skip:skip + length - start]
+    
+    rows, cols = array('q'), array('q')
+    top = left = first
+    bottom = right = size - 1 - first
+    while top <= bottom and left <= right and len(rows) < skip + length - start:
+        # Kanan, bawah, kiri, atas; setiap sisi sebagai satu rentang
+        rows.extend(repeat(top, right - left + 1))
+        cols.extend(range(left, right + 1))
+        rows.extend(range(top + 1, bottom + 1))
+        cols.extend(repeat(right, bottom - top))
+        if top < bottom:
+            rows.extend(repeat(bottom, right - left))
+            cols.extend(range(right - 1, left - 1, -1))
+        if left < right:
+            rows.extend(range(bottom - 1, top, -1))
+            cols.extend(repeat(left, bottom - top - 1))
+        top, left = top + 1, left + 1
+        bottom, right = bottom - 1, right - 1
+    
+    return rows[skip:skip + length - start], cols[skip:skip + length - start]
+
+def ring_band_cells(size, low, high):
+    """
+    Sel grid (baris, kolom) dengan jarak kuadrat dari pusat di [low, high)
+    Setiap baris menyumbang paling banyak dua rentang kolom (kiri dan kanan pusat)
+    """
+    center = size // 2
+    if np is not None:
+        offsets = np.arange(-center, size - center, dtype=np.int64)
+        offsets = offsets[offsets * offsets < high]
+        squared = offsets * offsets
+        inner = np.maximum(low - squared, 0)
+        first = np.where(inner > 0, _isqrt_array(np.maximum(inner - 1, 0)) + 1, 0)
+        last = _isqrt_array(high - 1 - squared)
+        # Rentang kanan [first, last] dan kiri [-last, -max(first, 1)], dipotong ke grid
+        spans = [(offsets, first, np.minimum(last, size - 1 - center)),
+                 (offsets, -np.minimum(last, center), -np.maximum(first, 1))]
+        rows, cols = [], []
+        for span_rows, starts, ends in spans:
+            counts = np.maximum(ends - starts + 1, 0)
+            total = int(counts.sum())
+            steps = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+            rows.append(np.repeat(span_rows, counts))
+            cols.append(np.repeat(starts, counts) + steps)
+        return np.concatenate(rows) + center, np.concatenate(cols) + center
+    
+    rows, cols = array('q'), array('q')
+    for offset in range(-center, size - center):
+        squared = offset * offset
+        if squared >= high:
+            continue
+        inner = max(low - squared, 0)
+        first = math.isqrt(inner - 1) + 1 if inner else 0
+        last = math.isqrt(high - 1 - squared)
+        for col in chain(range(-min(last, center), -max(first, 1) + 1),
+                         range(first, min(last, size - 1 - center) + 1)):
+            rows.append(offset + center)
+            cols.append(col + center)
+    return rows, cols
+
+def ring_bands(size, piece_items=RING_PIECE_ITEMS):
+    """
+    Pita jarak kuadrat [low, high) dari pusat ke luar: pita pertama berisi
+    tepat event horizon dan accretion disk (jarak kuadrat <= 4), pita
+    berikutnya selebar piece_items // 4 (sekitar piece_items sel)
+    """
+    center = size // 2
+    width = max(piece_items // 4, 1)
+    return chain([(0, 5)], ((low, low + width) for low in range(5, center * center * 2 + 1, width)))
+
+def ring_band_index(squared, piece_items=RING_PIECE_ITEMS):
+    """
+    Nomor pita ring_bands untuk jarak kuadrat (int atau ndarray)
+    """
+    width = max(piece_items // 4, 1)
+    if np is not None and isinstance(squared, np.ndarray):
+        return np.where(squared < 5, 0, 1 + (squared - 5) // width)
+    return 0 if squared < 5 else 1 + (squared - 5) // width
+
+def ring_band_sources(size, length, low, high):
+    """
+    Indeks spiral (< length) satu pita jarak dalam urutan cincin
+    (jarak kuadrat, baris, kolom)
+    """
+    center = size // 2
+    rows, cols = ring_band_cells(size, low, high)
+    if np is not None:
+        sources = spiral_indices(rows, cols, size)
+        keep = sources < length
+        rows, cols, sources = rows[keep], cols[keep], sources[keep]
+        squared = (rows - center) ** 2 + (cols - center) ** 2
+        if size < 1 << 16:
+            # Satu kunci int64 (jarak kuadrat, baris, kolom) lebih cepat dari lexsort
+            ranking = np.argsort((squared * size + rows) * size + cols)
+        else:
+            ranking = np.lexsort((cols, rows, squared))
+        return sources[ranking].astype(index_dtype(length))
+    
+    cells = sorted(((row - center) ** 2 + (col - center) ** 2, row, col, spiral_index(row, col, size))
+                   for row, col in zip(rows, cols))
+    return array(index_typecode(length), (source for *_, source in cells if source < length))
+
+def ring_sources(size, length, piece_items=RING_PIECE_ITEMS):
+    """
+    Indeks spiral dalam urutan cincin per pita ring_bands, tanpa mengurutkan
+    seluruh grid
+    """
+    for low, high in ring_bands(size, piece_items):
+        yield ring_band_sources(size, length, low, high)
+
+def external_piece_items(memory_budget):
+    """
+    Sel per pita mode eksternal: pita sebesar mungkin dalam memory_budget,
+    karena setiap pita memindai semua baris grid sekali
+    """
+    return max(RING_PIECE_ITEMS, memory_budget // RING_CELL_BYTES)
+
+def group_bands(keys, values, first, last):
+    """
+    Nilai per pita first..last-1 dari record (nomor pita, byte), urutan
+    kedatangan dipertahankan
+    """
+    if np is not None:
+        values = np.frombuffer(values, dtype=np.uint8)
+        if last - first == 1:
+            yield values
+            return
+        offsets = keys - first
+        if last - first <= 1 << 16:
+            # Sort stabil pada uint16 memakai radix sort
+            offsets = offsets.astype(np.uint16)
+        grouped = values[np.argsort(offsets, kind='stable')]
+        end = 0
+        for count in np.bincount(offsets, minlength=last - first).tolist():
+            start, end = end, end + count
+            yield grouped[start:end]
+        return
+    
+    groups = [bytearray() for _ in range(first, last)]
+    for key, value in zip(keys, values):
+        groups[key - first].append(value)
+    yield from groups
+
+def black_hole_regions(size, length):
+    """
+    Batas (event horizon, accretion disk) dalam urutan cincin tanpa
+    membangun tata letak: hitung sel terisi dengan jarak kuadrat <= 1 dan <= 4
+    """
+    center = size // 2
+    horizon_end = disk_end = 0
+    for row in range(max(center - 2, 0), min(center + 3, size)):
+        for col in range(max(center - 2, 0), min(center + 3, size)):
+            squared = (row - center) ** 2 + (col - center) ** 2
+            if squared <= 4 and spiral_index(row, col, size) < length:
+                disk_end += 1
+                horizon_end += squared <= 1
+    return horizon_end, disk_end
+
+def hawking_stream(pieces, swap):
+    """
+    Aliran radiasi Hawking per potongan (bytes, array, atau ndarray): tukar
+    pasangan berurutan bila swap; elemen tanpa pasangan dibawa ke potongan
+    berikutnya, dan yang terakhir tetap di tempat
+    """
+    pending = None
+    for piece in pieces:
+        if not swap or not len(piece):
+            yield piece
+            continue
+        
+        numeric = np is not None and isinstance(piece, np.ndarray)
+        if pending is not None:
+            piece = np.concatenate((pending, piece)) if numeric else pending + piece
+        paired = len(piece) // 2 * 2
+        pending = piece[paired:] if paired < len(piece) else None
+        if numeric:
+            yield piece[:paired].reshape(-1, 2)[:, ::-1].ravel()
+        else:
+            swapped = bytearray(piece[:paired]) if isinstance(piece, bytes) else piece[:paired]
+            swapped[0::2], swapped[1::2] = piece[1:paired:2], piece[0:paired:2]
+            yield swapped
+    if pending is not None:
+        yield pending
+
+def black_hole_metadata(layout, text):
+    """
+    Bangun metadata (grid dan kelompok karakter) dari tata letak
+    """
+    grid = [['' for _ in range(layout.size)] for _ in range(layout.size)]
+    rows, cols = spiral_coordinates(layout.size, len(text))
+    for index, char in enumerate(text):
+        grid[rows[index]][cols[index]] = char
+    
+    chars = [text[source] for source in layout.plan.order]
+    return {
+        'grid': grid,
+        'event_horizon': chars[:layout.horizon_end],
+        'accretion_disk': chars[layout.horizon_end:layout.disk_end],
+        'hawking_radiation': chars[layout.disk_end:]
+    }
 
 class BlackHoleCipher:
-    def __init__(self, gravitational_pull="strong"):
+    def __init__(self, gravitational_pull="strong", rounds=1):
         """
         Inisialisasi cipher dengan kekuatan gravitasi black hole
         gravitational_pull: "weak", "medium", "strong", "extreme"
+        rounds: berapa kali teks tersedot berturut-turut (default 1)
         """
         self.gravitational_pull = gravitational_pull
+        self.rounds = check_rounds(rounds)
         self.pull_factors = {
             "weak": 1,
             "medium": 2, 
@@ -21,6 +377,71 @@ class BlackHoleCipher:
         """
         return math.ceil(math.sqrt(length))
     
+    def layout(self, length):
+        """
+        Ambil tata letak black hole dari cache bersama untuk
+        (panjang, gravitational_pull); urutan akhir hanya bergantung pada itu
+        """
+        pull_factor = self.pull_factors[self.gravitational_pull]
+        key = ('black_hole_layout', pull_factor, length)
+        return PLAN_CACHE.get(key, lambda: self.build_layout(length))
+    
+    def plan(self, length):
+        """
+        TranspositionPlan black hole untuk panjang teks tertentu
+        (dipangkatkan sesuai rounds)
+        """
+        return plan_power(self.layout(length).plan, self.rounds)
+    
+    def ring_pieces(self, length, piece_items=RING_PIECE_ITEMS):
+        """
+        Urutan baca ciphertext per potongan (posisi, indeks sumber): cincin dari
+        pusat ke luar (ring_sources) dengan efek gravitasi; pertukaran pasangan
+        radiasi Hawking membawa indeks tanpa pasangan ke potongan berikutnya
+        """
+        size = self.calculate_grid_size(length)
+        pull_factor = self.pull_factors[self.gravitational_pull]
+        horizon_end, disk_end = black_hole_regions(size, length)
+        swap = pull_factor >= 5 and length - disk_end > 2
+        
+        pieces = ring_sources(size, length, piece_items)
+        head = self.distort_core([int(source) for source in next(pieces)], horizon_end)
+        if np is not None:
+            yield 0, np.array(head, dtype=index_dtype(length))
+        else:
+            yield 0, array(index_typecode(length), head)
+        
+        position = disk_end
+        for piece in hawking_stream(pieces, swap):
+            yield position, piece
+            position += len(piece)
+    
+    def build_layout(self, length):
+        """
+        Kompilasi sekali: gabungkan potongan ring_pieces ke satu array indeks
+        (int32 bila cukup) tanpa daftar Python
+        """
+        size = self.calculate_grid_size(length)
+        if np is not None:
+            order = np.empty(length, dtype=index_dtype(length))
+        else:
+            order = array(index_typecode(length), [0]) * length
+        for position, piece in self.ring_pieces(length):
+            order[position:position + len(piece)] = piece
+        
+        layout = BlackHoleLayout(size)
+        layout.horizon_end, layout.disk_end = black_hole_regions(size, length)
+        pull_factor = self.pull_factors[self.gravitational_pull]
+        layout.plan = TranspositionPlan(order, ('black_hole', pull_factor, length))
+        return layout
+    
+    def file_plan(self, length):
+        """
+        Plan mode mmap: salin per potongan ring_pieces tanpa array indeks penuh
+        """
+        copy_pass = lambda source, target, decrypt: copy_pieces(self.ring_pieces(length), source, target, decrypt)
+        return FilePlan(length, copy_pass, self.rounds)
+    
     def encrypt_black_hole(self, plaintext):
         """
         Enkripsi dengan pola black hole - teks tersedot ke pusat
@@ -29,116 +450,26 @@ class BlackHoleCipher:
         if len(text) <= 1:
             return text, None
         
-        size = self.calculate_grid_size(len(text))
-        grid = [['' for _ in range(size)] for _ in range(size)]
-        
-        # Isi grid dengan pola spiral masuk ke pusat (black hole effect)
-        directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # kanan, bawah, kiri, atas
-        direction_idx = 0
-        
-        row, col = 0, 0
-        char_idx = 0
-        
-        # Mulai dari luar dan spiral masuk ke pusat
-        for layer in range((size + 1) // 2):
-            # Isi layer dari luar ke dalam
-            
-            # Kanan
-            for _ in range(size - 2 * layer):
-                if char_idx < len(text):
-                    grid[row][col] = text[char_idx]
-                    char_idx += 1
-                if col < size - 1 - layer:
-                    col += 1
-            
-            # Bawah
-            for _ in range(size - 2 * layer - 1):
-                if char_idx < len(text):
-                    grid[row][col] = text[char_idx]
-                    char_idx += 1
-                if row < size - 1 - layer:
-                    row += 1
-            
-            # Kiri
-            for _ in range(size - 2 * layer - 1):
-                if char_idx < len(text):
-                    grid[row][col] = text[char_idx]
-                    char_idx += 1
-                if col > layer:
-                    col -= 1
-            
-            # Atas
-            for _ in range(size - 2 * layer - 2):
-                if char_idx < len(text):
-                    grid[row][col] = text[char_idx]
-                    char_idx += 1
-                if row > layer + 1:
-                    row -= 1
-            
-            # Pindah ke layer dalam
-            row = layer + 1
-            col = layer + 1
+        # Satu gather linear dengan urutan yang sudah dikompilasi
+        layout = self.layout(len(text))
+        ciphertext = self.plan(len(text)).apply(text)
         
-        return self.apply_gravitational_distortion(grid, text)
+        # Grid hanya dibangun bila metadata dibaca (visualisasi)
+        return ciphertext, BlackHoleMetadata(layout, text)
     
-    def apply_gravitational_distortion(self, grid, original_text):
+    def distort_core(self, core, horizon_end):
         """
-        Terapkan distorsi gravitasi pada grid
+        Efek gravitasi pada inti (event horizon lalu accretion disk) dalam urutan
+        cincin: horizon dibalik bila pull >= 2, cakram dipusar bila pull >= 3
         """
-        size = len(grid)
-        center = size // 2
         pull_factor = self.pull_factors[self.gravitational_pull]
-        
-        # Buat salinan grid untuk distorsi
-        distorted_grid = [row[:] for row in grid]
-        
-        # Hitung jarak dari pusat untuk setiap sel
-        distances = []
-        for i in range(size):
-            for j in range(size):
-                if grid[i][j]:
-                    distance = math.sqrt((i - center)**2 + (j - center)**2)
-                    distances.append((distance, i, j, grid[i][j]))
-        
-        # Urutkan berdasarkan jarak (terdekat dari pusat duluan)
-        distances.sort()
-        
-        # Terapkan efek black hole - karakter lebih dekat ke pusat dibaca lebih dulu
-        event_horizon = []  # Karakter yang terjebak di event horizon
-        accretion_disk = []  # Karakter di cakram akresi
-        hawking_radiation = []  # Karakter yang "terevaporasi"
-        
-        for i, (dist, row, col, char) in enumerate(distances):
-            if dist <= 1.0:  # Event horizon
-                event_horizon.append(char)
-            elif dist <= 2.0:  # Accretion disk
-                accretion_disk.append(char)
-            else:  # Hawking radiation
-                hawking_radiation.append(char)
-        
-        # Efek gravitasi: semakin kuat pull, semakin banyak perubahan urutan
+        event_horizon = list(core[:horizon_end])
+        accretion_disk = list(core[horizon_end:])
         if pull_factor >= 2:
-            # Balik urutan event horizon
             event_horizon.reverse()
-        
         if pull_factor >= 3:
-            # Acak accretion disk dengan pola tertentu
             accretion_disk = self.swirl_accretion_disk(accretion_disk)
-        
-        if pull_factor >= 5:
-            # Efek Hawking radiation - beberapa karakter "menguap"
-            hawking_radiation = self.apply_hawking_radiation(hawking_radiation)
-        
-        # Gabungkan hasil dengan urutan black hole
-        ciphertext = ''.join(event_horizon + accretion_disk + hawking_radiation)
-        
-        return ciphertext, {
-            'grid': distorted_grid,
-            'event_horizon': event_horizon,
-            'accretion_disk': accretion_disk,
-            'hawking_radiation': hawking_radiation,
-            'original_distances': distances
-        }
+        return event_horizon + accretion_disk
     
     def swirl_accretion_disk(self, disk_chars):
         """
@@ -162,129 +493,69 @@ class BlackHoleCipher:
         
         return swirled
     
-    def apply_hawking_radiation(self, radiation_chars):
-        """
-        Efek radiasi Hawking - beberapa karakter berubah posisi
-        """
-        if len(radiation_chars) <= 2:
-            return radiation_chars
-        
-        # Efek quantum - tukar posisi karakter secara berpasangan
-        result = radiation_chars[:]
-        for i in range(0, len(result) - 1, 2):
-            result[i], result[i + 1] = result[i + 1], result[i]
-        
-        return result
-    
-    def decrypt_black_hole(self, ciphertext, metadata):
+    def decrypt_black_hole(self, ciphertext, metadata=None):
         """
         Dekripsi dari black hole - membalik efek gravitasi
+        Cukup panjang ciphertext dan gravitational_pull; metadata tidak diperlukan
         """
         if len(ciphertext) <= 1:
             return ciphertext
         
-        # Ekstrak informasi dari metadata
-        event_horizon = metadata['event_horizon']
-        accretion_disk = metadata['accretion_disk']
-        hawking_radiation = metadata['hawking_radiation']
-        distances = metadata['original_distances']
-        
-        pull_factor = self.pull_factors[self.gravitational_pull]
-        
-        # Balik efek hawking radiation
-        if pull_factor >= 5:
-            hawking_radiation = self.reverse_hawking_radiation(hawking_radiation)
-        
-        # Balik efek accretion disk
-        if pull_factor >= 3:
-            accretion_disk = self.reverse_swirl_accretion_disk(accretion_disk)
-        
-        # Balik efek event horizon
-        if pull_factor >= 2:
-            event_horizon.reverse()
-        
-        # Rekonstruksi berdasarkan jarak asli
-        chars_by_distance = {}
-        all_chars = event_horizon + accretion_disk + hawking_radiation
-        
-        for i, (dist, row, col, orig_char) in enumerate(distances):
-            if i < len(all_chars):
-                chars_by_distance[(row, col)] = all_chars[i]
-        
-        # Susun kembali dalam urutan spiral asli
-        size = int(math.sqrt(len(distances))) + 1
-        reconstructed = [''] * len(ciphertext)
-        
-        char_idx = 0
-        for layer in range((size + 1) // 2):
-            row, col = layer, layer
-            
-            # Kanan
-            for _ in range(size - 2 * layer):
-                if (row, col) in chars_by_distance and char_idx < len(reconstructed):
-                    reconstructed[char_idx] = chars_by_distance[(row, col)]
-                    char_idx += 1
-                if col < size - 1 - layer:
-                    col += 1
-            
-            # Bawah
-            for _ in range(size - 2 * layer - 1):
-                if (row, col) in chars_by_distance and char_idx < len(reconstructed):
-                    reconstructed[char_idx] = chars_by_distance[(row, col)]
-                    char_idx += 1
-                if row < size - 1 - layer:
-                    row += 1
-            
-            # Kiri
-            for _ in range(size - 2 * layer - 1):
-                if (row, col) in chars_by_distance and char_idx < len(reconstructed):
-                    reconstructed[char_idx] = chars_by_distance[(row, col)]
-                    char_idx += 1
-                if col > layer:
-                    col -= 1
-            
-            # Atas
-            for _ in range(size - 2 * layer - 2):
-                if (row, col) in chars_by_distance and char_idx < len(reconstructed):
-                    reconstructed[char_idx] = chars_by_distance[(row, col)]
-                    char_idx += 1
-                if row > layer + 1:
-                    row -= 1
-            
-            # Pindah ke layer dalam
-            row = layer + 1
-            col = layer + 1
-        
-        return ''.join(reconstructed)
+        # Permutasi invers dari tata letak yang sama dengan enkripsi
+        return self.plan(len(ciphertext)).invert(ciphertext)
     
-    def reverse_hawking_radiation(self, radiation_chars):
+    def encrypt_inplace(self, buffer):
         """
-        Balik efek radiasi Hawking
+        Sedot isi bytearray/mmap langsung di tempat, tanpa normalisasi
+        Urutan dibangun per potongan ke mmap sementara (tidak di-cache, tidak di heap)
         """
-        result = radiation_chars[:]
-        for i in range(0, len(result) - 1, 2):
-            result[i], result[i + 1] = result[i + 1], result[i]
-        return result
+        if len(buffer) <= 1:
+            return buffer
+        return permute_inplace_pieces(buffer, self.ring_pieces(len(buffer)), self.rounds)
     
-    def reverse_swirl_accretion_disk(self, swirled_chars):
+    def decrypt_inplace(self, buffer):
         """
-        Balik efek pusaran cakram akresi
+        Keluarkan isi bytearray/mmap dari black hole langsung di tempat
         """
-        if len(swirled_chars) <= 1:
-            return swirled_chars
-        
-        # Pisahkan kembali berdasarkan pola interleave
-        part1, part2 = [], []
-        for i, char in enumerate(swirled_chars):
-            if i % 2 == 0:
-                part1.append(char)
-            else:
-                part2.append(char)
-        
-        # Balik part2 karena efek pusaran
-        part2.reverse()
-        
-        return part1 + part2
+        if len(buffer) <= 1:
+            return buffer
+        return permute_inplace_pieces(buffer, self.ring_pieces(len(buffer)), self.rounds, decrypt=True)
+    
+    def encrypt_stream(self, chunks, frame_size=DEFAULT_FRAME_SIZE):
+        """
+        Sedot aliran potongan bytes per frame berukuran tetap, tanpa normalisasi;
+        setiap frame dihasilkan begitu lengkap (buffer paling banyak satu frame)
+        """
+        return stream_frames(chunks, frame_size, self.plan)
+    
+    def decrypt_stream(self, chunks, frame_size=DEFAULT_FRAME_SIZE):
+        """
+        Keluarkan aliran potongan bytes hasil encrypt_stream dengan ukuran frame yang sama
+        """
+        return stream_frames(chunks, frame_size, self.plan, decrypt=True)
+    
+    def container_spec(self):
+        """
+        Spec container BlackHoleCipher: parameter black hole di header
+        """
+        params = {'GRAVITY': self.gravitational_pull, 'ROUNDS': self.rounds}
+        return 'black_hole', params, container_planner(params), CONTAINER_CHUNK_SIZE
+    
+    def encrypt_batch(self, input_dir, output_dir, workers=None, processes=False):
+        """
+        Sedot pohon input_dir ke output_dir, satu container black hole per file. Mengembalikan BatchStats
+        """
+        stats = encrypt_batch_files(input_dir, output_dir, self.container_spec(), workers, processes)
+        print_batch_report(stats, f"🌌 Batch: {stats.files} file tersedot ke black hole", "❌ Error")
+        return stats
+    
+    def decrypt_batch(self, input_dir, output_dir, workers=None, processes=False):
+        """
+        Keluarkan pohon container black hole hasil encrypt_batch. Mengembalikan BatchStats
+        """
+        stats = decrypt_batch_files(input_dir, output_dir, 'black_hole', container_planner, workers, processes)
+        print_batch_report(stats, f"🌌 Batch: {stats.files} file lolos dari black hole", "❌ Error")
+        return stats
     
     def visualize_black_hole(self, grid, metadata, original_text):
         """
@@ -327,27 +598,41 @@ class BlackHoleCipher:
         if pull_factor >= 5:
             print("  ✓ Hawking Radiation: Quantum entanglement")
     
-    def encrypt_file(self, input_file, output_file):
+    def encrypt_file(self, input_file, output_file, use_mmap=False, container=False, workers=None):
         """
         Enkripsi file dengan black hole
+        use_mmap: transposisi byte mentah lewat mmap tanpa decode/normalisasi
+        (untuk file besar); mengembalikan jumlah byte
+        container: tulis container biner bersama (chunk + CRC32, byte mentah);
+        mengembalikan jumlah byte
+        workers: enkripsi chunk container secara paralel (workers > 1 memakai container)
         """
         try:
+            if container or (workers and workers > 1):
+                total = encrypt_container_file(input_file, output_file, self.container_spec(), workers)
+                
+                print(f"🌌 File tersedot ke black hole (container): {input_file} -> {output_file}")
+                return total
+            
+            if use_mmap:
+                header = self.byte_header(os.path.getsize(input_file))
+                total = permute_file(input_file, output_file, self.file_plan, header)
+                
+                print(f"🌌 File tersedot ke black hole (mmap): {input_file} -> {output_file}")
+                return total
+            
             with open(input_file, 'r', encoding='utf-8') as f:
                 content = f.read()
             
             encrypted, metadata = self.encrypt_black_hole(content)
             
-            # Simpan metadata untuk dekripsi
-            file_metadata = {
-                'gravitational_pull': self.gravitational_pull,
-                'original_length': len(content.replace(' ', '')),
-                'metadata': metadata
-            }
-            
-            with open(output_file, 'w', encoding='utf-8') as f:
+            # Header cukup berisi gravitasi dan panjang untuk dekripsi
+            with open(output_file, 'w', encoding='utf-8', newline='') as f:
                 f.write(f"BLACKHOLE_CIPHER\n")
                 f.write(f"GRAVITY:{self.gravitational_pull}\n")
                 f.write(f"LENGTH:{len(content.replace(' ', ''))}\n")
+                if self.rounds != 1:
+                    f.write(f"ROUNDS:{self.rounds}\n")
                 f.write("---\n")
                 f.write(encrypted)
             
@@ -361,37 +646,47 @@ class BlackHoleCipher:
             print(f"❌ Error saat enkripsi: {e}")
             return None, None
     
-    def decrypt_file(self, input_file, output_file):
+    def decrypt_file(self, input_file, output_file, use_mmap=False, workers=None):
         """
         Dekripsi file dari black hole
+        File hasil mode mmap (UNIT:bytes) dan container dikenali otomatis
+        workers: dekripsi chunk container secara paralel
         """
         try:
-            with open(input_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            if is_container_file(input_file):
+                total = decrypt_container_file(input_file, output_file, 'black_hole', container_planner, workers)
+                
+                print(f"🌌 File berhasil melarikan diri dari black hole (container): {input_file} -> {output_file}")
+                return total
             
-            lines = content.split('\n')
-            if not lines[0].startswith("BLACKHOLE_CIPHER"):
+            with open(input_file, 'rb') as f:
+                magic, fields, header_length = read_header_fields(f)
+            if magic != "BLACKHOLE_CIPHER":
                 raise ValueError("Bukan file black hole cipher!")
             
-            # Parse metadata
-            gravity = lines[1].split(':')[1]
-            original_length = int(lines[2].split(':')[1])
+            if use_mmap or fields.get('UNIT') == 'bytes':
+                cipher = BlackHoleCipher(fields['GRAVITY'], int(fields.get('ROUNDS', 1)))
+                total = permute_file(input_file, output_file, cipher.file_plan,
+                                     offset=header_length, decrypt=True)
+                
+                print(f"🌌 File berhasil melarikan diri dari black hole (mmap): {input_file} -> {output_file}")
+                return total
             
-            # Ambil encrypted content
-            encrypted_content = '\n'.join(lines[4:])
+            with open(input_file, 'r', encoding='utf-8', newline='') as f:
+                content = f.read()
             
-            # Set gravitational pull dan dekripsi
-            old_gravity = self.gravitational_pull
-            self.gravitational_pull = gravity
+            if not content.startswith("BLACKHOLE_CIPHER\n"):
+                raise ValueError("Bukan file black hole cipher!")
             
-            # Untuk dekripsi, kita perlu merekonstruksi metadata
-            # Ini adalah simplifikasi - dalam implementasi nyata, metadata harus disimpan
-            temp_encrypted, temp_metadata = self.encrypt_black_hole('A' * original_length)
-            decrypted = encrypted_content  # Simplified untuk demo
+            # Parse metadata sampai pemisah ---
+            header, encrypted_content = content.split('---\n', 1)
+            fields = dict(line.split(':', 1) for line in header.split('\n')[1:] if ':' in line)
+            gravity = fields['GRAVITY']
+            rounds = int(fields.get('ROUNDS', 1))
             
-            self.gravitational_pull = old_gravity
+            decrypted = BlackHoleCipher(gravity, rounds).decrypt_black_hole(encrypted_content)
             
-            with open(output_file, 'w', encoding='utf-8') as f:
+            with open(output_file, 'w', encoding='utf-8', newline='') as f:
                 f.write(decrypted)
             
             print(f"🌌 File berhasil melarikan diri dari black hole: {input_file} -> {output_file}")
@@ -403,6 +698,168 @@ class BlackHoleCipher:
         except Exception as e:
             print(f"❌ Error saat dekripsi: {e}")
             return None
+    
+    def byte_header(self, length):
+        """
+        Header file untuk mode byte mentah (mmap dan eksternal)
+        """
+        header = f"BLACKHOLE_CIPHER\nGRAVITY:{self.gravitational_pull}\nLENGTH:{length}\n"
+        if self.rounds != 1:
+            header += f"ROUNDS:{self.rounds}\n"
+        return (header + "UNIT:bytes\n---\n").encode('utf-8')
+    
+    def _external_encrypt_pass(self, source, target, length, memory_budget, tmp_dir):
+        """
+        Satu putaran enkripsi eksternal: input dibaca berurutan dan setiap byte
+        dikirim ke pita jarak sel spiralnya (distribute_external); per pita,
+        byte diurutkan ke urutan cincin di memori, lalu efek gravitasi
+        diterapkan sambil menulis
+        """
+        size = self.calculate_grid_size(length)
+        center = size // 2
+        pull_factor = self.pull_factors[self.gravitational_pull]
+        horizon_end, disk_end = black_hole_regions(size, length)
+        piece_items = external_piece_items(memory_budget)
+        band_count = ring_band_index(center * center * 2, piece_items) + 1
+        
+        def band_records():
+            # Nomor pita per byte, dihitung per blok dari koordinat spiralnya
+            for start in range(0, length, COPY_CHUNK):
+                values = source.read(min(COPY_CHUNK, length - start))
+                rows, cols = spiral_coordinates(size, start + len(values), start)
+                if np is not None:
+                    bands = ring_band_index((rows - center) ** 2 + (cols - center) ** 2, piece_items)
+                    yield bands.astype(index_dtype(band_count)), values
+                else:
+                    yield array(index_typecode(band_count),
+                                (ring_band_index((row - center) ** 2 + (col - center) ** 2, piece_items)
+                                 for row, col in zip(rows, cols))), values
+        
+        def ranked_pieces():
+            bands = ring_bands(size, piece_items)
+            for first, last, keys, values in distribute_external(band_records(), band_count, memory_budget, tmp_dir):
+                # Byte satu pita tersimpan menurut indeks spiral naik; peringkat
+                # setiap sumber di antara sumber pita memberi posisinya
+                for band_values in group_bands(keys, values, first, last):
+                    sources = ring_band_sources(size, length, *next(bands))
+                    if np is not None:
+                        ranked = np.empty_like(band_values)
+                        ranked[np.argsort(sources)] = band_values
+                        yield ranked
+                    else:
+                        rank = {source: position for position, source in enumerate(sorted(sources))}
+                        yield bytes(band_values[rank[source]] for source in sources)
+        
+        pieces = ranked_pieces()
+        # Kepala (event horizon + accretion disk) adalah pita pertama, paling banyak 13 byte
+        target.write(bytes(self.distort_core(bytes(next(pieces)), horizon_end)))
+        
+        swap = pull_factor >= 5 and length - disk_end > 2
+        for piece in hawking_stream(pieces, swap):
+            target.write(piece)
+    
+    def _external_decrypt_pass(self, source, target, length, memory_budget, tmp_dir):
+        """
+        Satu putaran dekripsi eksternal: batalkan efek gravitasi secara berurutan,
+        pasangkan byte dengan indeks plaintext per pita cincin, lalu kirim ke
+        rentang indeks tujuan (distribute_external) dan tulis setiap rentang
+        berurutan setelah disebar di memori
+        """
+        size = self.calculate_grid_size(length)
+        pull_factor = self.pull_factors[self.gravitational_pull]
+        horizon_end, disk_end = black_hole_regions(size, length)
+        
+        head = source.read(disk_end)
+        event_horizon = list(head[:horizon_end])
+        swirled = list(head[horizon_end:])
+        if pull_factor >= 2:
+            event_horizon.reverse()
+        accretion_disk = swirled
+        if pull_factor >= 3:
+            # Pusaran hanya menyusun ulang posisi, jadi cukup dibalik lewat indeksnya
+            accretion_disk = [0] * len(swirled)
+            for position, index in enumerate(self.swirl_accretion_disk(list(range(len(swirled))))):
+                accretion_disk[index] = swirled[position]
+        
+        swap = pull_factor >= 5 and length - disk_end > 2
+        tail = iter(lambda: source.read(COPY_CHUNK), b"")
+        ranked = chain([bytes(event_horizon + accretion_disk)], hawking_stream(tail, swap))
+        
+        def index_records():
+            pending = bytearray()
+            for sources in ring_sources(size, length, external_piece_items(memory_budget)):
+                while len(pending) < len(sources):
+                    pending += next(ranked)
+                yield sources, bytes(pending[:len(sources)])
+                del pending[:len(sources)]
+        
+        for first, last, keys, values in distribute_external(index_records(), length, memory_budget, tmp_dir):
+            if np is not None:
+                block = np.empty(last - first, dtype=np.uint8)
+                block[keys - first] = np.frombuffer(values, dtype=np.uint8)
+            else:
+                block = bytearray(last - first)
+                for key, value in zip(keys, values):
+                    block[key - first] = value
+            target.write(block)
+    
+    def encrypt_file_external(self, input_file, output_file, memory_budget=DEFAULT_MEMORY_BUDGET,
+                              tmp_dir=None):
+        """
+        Enkripsi file yang lebih besar dari RAM: byte mentah dibagi per pita
+        jarak ke file bucket di tmp_dir (baca dan tulis berurutan)
+        Header sama dengan mode mmap; mengembalikan jumlah byte
+        """
+        try:
+            with open(input_file, 'rb') as source, open(output_file, 'wb') as target:
+                length = os.fstat(source.fileno()).st_size
+                target.write(self.byte_header(length))
+                chain_passes(source, target, length, self.rounds,
+                             lambda src, dst, n: self._external_encrypt_pass(src, dst, n, memory_budget, tmp_dir),
+                             tmp_dir)
+            
+            print(f"🌌 File tersedot ke black hole (eksternal): {input_file} -> {output_file}")
+            return length
+            
+        except FileNotFoundError:
+            print(f"❌ Error: File {input_file} tidak ditemukan!")
+            return None
+        except Exception as e:
+            print(f"❌ Error saat enkripsi: {e}")
+            return None
+    
+    def decrypt_file_external(self, input_file, output_file, memory_budget=DEFAULT_MEMORY_BUDGET,
+                              tmp_dir=None):
+        """
+        Dekripsi file mode byte (mmap/eksternal) dengan memori terbatas
+        """
+        try:
+            with open(input_file, 'rb') as source, open(output_file, 'wb') as target:
+                magic, fields, header_length = read_header_fields(source)
+                if magic != "BLACKHOLE_CIPHER":
+                    raise ValueError("Bukan file black hole cipher!")
+                
+                cipher = BlackHoleCipher(fields['GRAVITY'], int(fields.get('ROUNDS', 1)))
+                length = os.fstat(source.fileno()).st_size - header_length
+                chain_passes(source, target, length, cipher.rounds,
+                             lambda src, dst, n: cipher._external_decrypt_pass(src, dst, n, memory_budget, tmp_dir),
+                             tmp_dir)
+            
+            print(f"🌌 File berhasil melarikan diri dari black hole (eksternal): {input_file} -> {output_file}")
+            return length
+            
+        except FileNotFoundError:
+            print(f"❌ Error: File {input_file} tidak ditemukan!")
+            return None
+        except Exception as e:
+            print(f"❌ Error saat dekripsi: {e}")
+            return None
+
+def container_planner(params):
+    """
+    Planner BlackHoleCipher dari header container (parameter black hole)
+    """
+    return (BlackHoleCipher, (params['GRAVITY'], int(params.get('ROUNDS', 1))), {})
 
 def demo():
     """
@@ -429,9 +886,10 @@ def demo():
         # Visualisasi
         cipher.visualize_black_hole(metadata['grid'], metadata, original_text)
         
-        # Dekripsi (simplified)
-        print(f"\n🔓 Simulasi dekripsi...")
-        print(f"✅ Teks berhasil melarikan diri dari black hole!")
+        # Dekripsi
+        decrypted = cipher.decrypt_black_hole(encrypted)
+        print(f"\n🔓 Decrypted: {decrypted}")
+        print(f"✅ Berhasil: {'✓' if decrypted == original_text.replace(' ', '').upper() else '✗'}")
     
     print(f"\n{'='*60}")
     
@@ -457,8 +915,14 @@ def demo():
         content = f.read()
         print(f"  {content[:100]}..." if len(content) > 100 else f"  {content}")
     
+    cipher.decrypt_file(encrypted_file, escaped_file)
+    
+    print(f"\n📄 File terdekripsi:")
+    with open(escaped_file, 'r', encoding='utf-8') as f:
+        print(f"  {f.read()}")
+    
     # Cleanup
-    for file in [sample_file, encrypted_file]:
+    for file in [sample_file, encrypted_file, escaped_file]:
         if os.path.exists(file):
             os.remove(file)
 
@@ -498,9 +962,17 @@ def interactive_mode():
                 cipher.visualize_black_hole(metadata['grid'], metadata, text)
         
         elif choice == '2':
-            print("🔓 Dekripsi dari black hole (simplified demo)")
             text = input("📝 Masukkan teks terenkripsi: ")
-            print(f"✅ Teks berhasil melarikan diri: {text}")
+            print("\n⚡ Pilih kekuatan gravitasi yang dipakai saat enkripsi:")
+            print("1. Weak 🔵   2. Medium 🟡   3. Strong 🔴   4. Extreme ⚫")
+            gravity_choice = input("Pilih (1-4): ").strip()
+            
+            gravity_map = {"1": "weak", "2": "medium", "3": "strong", "4": "extreme"}
+            gravity = gravity_map.get(gravity_choice, "medium")
+            
+            cipher = BlackHoleCipher(gravity)
+            decrypted = cipher.decrypt_black_hole(text)
+            print(f"✅ Teks berhasil melarikan diri: {decrypted}")
         
         elif choice == '3':
             input_file = input("📄 Nama file input: ")
@@ -541,9 +1013,31 @@ def interactive_mode():
         else:
             print("❌ Pilihan tidak valid! Coba lagi.")
 
+def add_cli_arguments(parser, command):
+    """
+    Parameter cipher untuk baris perintah (sama untuk semua subperintah)
+    """
+    parser.add_argument("--gravity", choices=("weak", "medium", "strong", "extreme"), default="strong",
+                        help="gravitational pull (default strong)")
+    parser.add_argument("--rounds", type=non_negative_int, default=1, help="jumlah putaran (default 1)")
+
+def cipher_from_args(args):
+    """
+    Bangun cipher dan argumen stream (atau argumen encrypt_batch) dari argumen baris perintah
+    Tanpa NumPy stream black hole memakai kernel Python murni (dengan peringatan)
+    """
+    options = {}
+    if args.command != "batch":
+        warn_without_numpy("Stream black hole")
+        options['frame_size'] = args.frame_size or DEFAULT_FRAME_SIZE
+    return BlackHoleCipher(args.gravity, args.rounds), options
+
+def main(argv=None):
+    """
+    Titik masuk baris perintah BlackHoleCipher
+    """
+    return run_cli(argv, "Black Hole Cipher", add_cli_arguments, cipher_from_args, demo, interactive_mode)
+
 if __name__ == "__main__":
-    # Jalankan demo
-    demo()
-    
-    # Jalankan mode interaktif
-    interactive_mode()
\ No newline at end of file
+    # Tanpa argumen: demo lalu mode interaktif
+    raise SystemExit(main())
@@ -1,12 +1,96 @@
 import os
+import shutil
+import tempfile
+from array import array
+
+from polaplan import (CONTAINER_CHUNK_SIZE, COPY_CHUNK, DEFAULT_FRAME_SIZE, DEFAULT_MEMORY_BUDGET, FilePlan,
+                      byte_source, chain_passes, check_rounds, compile_plan, decrypt_batch_files,
+                      decrypt_container_file, encrypt_batch_files, encrypt_container_file, index_array,
+                      index_dtype, index_typecode, is_container_file, iter_frames, non_negative_int,
+                      normalize_bytes, np, permute_file, permute_inplace_pieces, plan_power,
+                      print_batch_report, run_cli)
+
+# Header dan ukuran blok default untuk mode blok (framed)
+FRAMED_MAGIC = "ARROW_CIPHER"
+DEFAULT_BLOCK_SIZE = 1 << 16
 
 class ArrowCipher:
-    def __init__(self, depth=4):
+    def __init__(self, depth=4, rounds=1):
         """
         Inisialisasi cipher dengan kedalaman panah
         depth: jumlah baris dalam pola panah (default 4)
+        rounds: jumlah putaran enkripsi berturut-turut (default 1)
         """
         self.depth = depth
+        self.rounds = check_rounds(rounds)
+    
+    def row_lengths(self, length):
+        """
+        Hitung jumlah karakter di setiap baris untuk teks sepanjang length
+        """
+        if self.depth <= 1:
+            return [length]
+        
+        period = 2 * (self.depth - 1)
+        lengths = [len(range(0, length, period))]
+        for row in range(1, self.depth - 1):
+            lengths.append(len(range(row, length, period)) + len(range(period - row, length, period)))
+        lengths.append(len(range(self.depth - 1, length, period)))
+        return lengths
+    
+    def row_pieces(self, length, piece_size=COPY_CHUNK):
+        """
+        Permutasi pola panah per potongan (posisi, indeks sumber) paling banyak
+        piece_size indeks, baris demi baris tanpa membangun urutan lengkap
+        """
+        period = 2 * (self.depth - 1)
+        if np is not None:
+            dtype = index_dtype(length)
+            empty = lambda size: np.empty(size, dtype=dtype)
+            arange = lambda start, count: np.arange(start, start + count * period, period, dtype=dtype)
+        else:
+            typecode = index_typecode(length)
+            empty = lambda size: array(typecode, [0]) * size
+            arange = lambda start, count: array(typecode, range(start, start + count * period, period))
+        
+        # Baris tengah dilewati dua kali per periode (turun lalu naik) sehingga
+        # kedua fase berselang-seling; indeks ke-i fase turn = phase + (i // 2) * period
+        offset = 0
+        for row in range(self.depth):
+            phases = [row] if row in (0, self.depth - 1) else [row, period - row]
+            row_length = sum(len(range(phase, length, period)) for phase in phases)
+            for low in range(0, row_length, piece_size):
+                high = min(low + piece_size, row_length)
+                piece = empty(high - low)
+                for turn, phase in enumerate(phases):
+                    first = low + (turn - low) % len(phases)
+                    count = len(range(first, high, len(phases)))
+                    piece[first - low::len(phases)] = arange(phase + first // len(phases) * period, count)
+                yield offset + low, piece
+            offset += row_length
+    
+    def build_order(self, length):
+        """
+        Bangun permutasi indeks plaintext -> ciphertext untuk pola panah:
+        ciphertext[k] = plaintext[order[k]]
+        """
+        if self.depth <= 1:
+            return index_array(range(length))
+        
+        if np is not None:
+            order = np.empty(length, dtype=index_dtype(length))
+        else:
+            order = array(index_typecode(length), [0]) * length
+        for position, piece in self.row_pieces(length):
+            order[position:position + len(piece)] = piece
+        return order
+    
+    def plan(self, length):
+        """
+        Ambil TranspositionPlan dari cache untuk (depth, length, rounds)
+        """
+        plan = compile_plan(('arrow', self.depth, length), lambda: self.build_order(length))
+        return plan_power(plan, self.rounds)
     
     def encrypt_text(self, plaintext):
         """
@@ -18,26 +102,15 @@ class ArrowCipher:
         # Hilangkan spasi dan ubah ke uppercase
         text = plaintext.replace(" ", "").upper()
         
-        # Buat array untuk setiap baris
-        rows = [[] for _ in range(self.depth)]
-        
-        current_row = 0
-        direction = 1  # 1 untuk turun, -1 untuk naik
+        # Satu kali gather dengan permutasi yang sudah dikompilasi
+        ciphertext = self.plan(len(text)).apply(text)
         
-        # Isi karakter ke dalam pola panah
-        for char in text:
-            rows[current_row].append(char)
-            
-            # Ubah arah di batas atas dan bawah
-            if current_row == 0:
-                direction = 1
-            elif current_row == self.depth - 1:
-                direction = -1
-            
-            current_row += direction
-        
-        # Gabungkan semua baris untuk mendapatkan ciphertext
-        ciphertext = ''.join([''.join(row) for row in rows])
+        # Potong ciphertext menjadi baris-baris untuk visualisasi
+        rows = []
+        start = 0
+        for length in self.row_lengths(len(text)):
+            rows.append(ciphertext[start:start + length])
+            start += length
         
         return ciphertext, rows
     
@@ -48,46 +121,125 @@ class ArrowCipher:
         if len(ciphertext) <= 1:
             return ciphertext
         
-        # Hitung jumlah karakter di setiap baris
-        row_lengths = [0] * self.depth
-        current_row = 0
-        direction = 1
+        return self.plan(len(ciphertext)).invert(ciphertext)
+    
+    def row_position(self, index):
+        """
+        Hitung (baris, posisi dalam baris) untuk indeks plaintext secara langsung
+        Pola berulang dengan periode 2 * (depth - 1)
+        """
+        if self.depth <= 1:
+            return 0, index
         
-        for _ in range(len(ciphertext)):
-            row_lengths[current_row] += 1
-            
-            if current_row == 0:
-                direction = 1
-            elif current_row == self.depth - 1:
-                direction = -1
-            
-            current_row += direction
+        period = 2 * (self.depth - 1)
+        cycle, phase = divmod(index, period)
+        if phase == 0:
+            return 0, cycle
+        if phase == self.depth - 1:
+            return self.depth - 1, cycle
+        if phase < self.depth - 1:
+            return phase, 2 * cycle
+        return period - phase, 2 * cycle + 1
+    
+    def cipher_offset(self, index, length):
+        """
+        Offset ciphertext dari indeks plaintext tanpa membangun baris
+        """
+        row, position = self.row_position(index)
+        return sum(self.row_lengths(length)[:row]) + position
+    
+    def _decrypt_range(self, read, length, start, stop):
+        """
+        Dekripsi plaintext[start:stop] hanya dengan membaca bagian ciphertext
+        yang dibutuhkan; read(offset, size) mengembalikan potongan ciphertext
+        """
+        start, stop, _ = slice(start, stop).indices(length)
+        size = max(stop - start, 0)
+        if self.depth <= 1 or size == 0:
+            return read(start, size)
         
-        # Bagi ciphertext ke dalam baris-baris
-        rows = []
-        start = 0
-        for length in row_lengths:
-            rows.append(list(ciphertext[start:start + length]))
-            start += length
+        if self.rounds != 1:
+            # Beberapa putaran tidak lagi berpola baris; baca rentang yang memuat
+            # semua posisi ciphertext yang dibutuhkan
+            offsets = self.plan(length).inverse[start:stop]
+            low = min(offsets)
+            part = read(low, max(offsets) - low + 1)
+            if isinstance(part, str):
+                return ''.join(part[offset - low] for offset in offsets)
+            return bytes(part[offset - low] for offset in offsets)
         
-        # Rekonstruksi teks asli dengan mengikuti pola panah
-        plaintext = []
-        current_row = 0
-        direction = 1
-        row_indices = [0] * self.depth
+        period = 2 * (self.depth - 1)
+        row_starts = [0]
+        for row_length in self.row_lengths(length)[:-1]:
+            row_starts.append(row_starts[-1] + row_length)
         
-        for _ in range(len(ciphertext)):
-            plaintext.append(rows[current_row][row_indices[current_row]])
-            row_indices[current_row] += 1
+        result = None
+        for row in range(self.depth):
+            phases = {row, (period - row) % period}
             
-            if current_row == 0:
-                direction = 1
-            elif current_row == self.depth - 1:
-                direction = -1
+            # Indeks pertama setiap fase di dalam [start, stop)
+            firsts = sorted(start + (phase - start) % period for phase in phases)
+            firsts = [first for first in firsts if first < stop]
+            if not firsts:
+                continue
             
-            current_row += direction
+            # Dalam satu baris, karakter di [start, stop) selalu bersebelahan
+            count = sum(len(range(first, stop, period)) for first in firsts)
+            offset = row_starts[row] + self.row_position(firsts[0])[1]
+            part = read(offset, count)
+            
+            if result is None:
+                result = [''] * size if isinstance(part, str) else bytearray(size)
+            
+            # Fase turun dan naik bergantian di dalam baris tengah
+            for turn, first in enumerate(firsts):
+                result[first - start::period] = part[turn::len(firsts)]
         
-        return ''.join(plaintext)
+        return ''.join(result) if isinstance(result, list) else bytes(result)
+    
+    def decrypt_slice(self, ciphertext, start, stop):
+        """
+        Dekripsi hanya plaintext[start:stop] dari ciphertext
+        Waktu dan memori O(stop - start)
+        """
+        return self._decrypt_range(lambda offset, size: ciphertext[offset:offset + size],
+                                   len(ciphertext), start, stop)
+    
+    def decrypt_file_slice(self, input_file, start, stop):
+        """
+        Dekripsi plaintext[start:stop] langsung dari file terenkripsi di disk
+        Offset dihitung dalam byte (sama dengan karakter untuk teks ASCII);
+        file mode blok juga didukung
+        """
+        framed = self.is_framed_file(input_file)
+        with open(input_file, 'rb') as f:
+            if not framed:
+                length = os.fstat(f.fileno()).st_size
+                
+                def read(offset, size):
+                    f.seek(offset)
+                    return f.read(size)
+                
+                return self._decrypt_range(read, length, start, stop)
+            
+            # Mode blok: setiap blok didekripsi terpisah dari posisinya sendiri
+            block_size, header_length = self.read_framed_header(f)
+            length = os.fstat(f.fileno()).st_size - header_length
+            start, stop, _ = slice(start, stop).indices(length)
+            
+            parts = []
+            for block_start in range(start - start % block_size, stop, block_size):
+                base = header_length + block_start
+                
+                def read(offset, size, base=base):
+                    f.seek(base + offset)
+                    return f.read(size)
+                
+                block_length = min(block_size, length - block_start)
+                parts.append(self._decrypt_range(read, block_length,
+                                                 max(start - block_start, 0),
+                                                 min(stop - block_start, block_length)))
+            return b''.join(parts)
     
     def visualize_pattern(self, text, rows):
         """
@@ -122,11 +274,243 @@ class ArrowCipher:
         for i, row in enumerate(rows):
             print(f"Baris {i+1}: {''.join(row)}")
     
-    def encrypt_file(self, input_file, output_file):
+    def _zigzag_bytes(self, source, decrypt=False):
+        """
+        Transposisi zigzag langsung antar buffer bytes dengan slicing,
+        ditulis ke satu buffer output yang dialokasikan di awal
+        """
+        length = len(source)
+        if self.rounds != 1 and self.depth > 1:
+            plan = self.plan(length)
+            return bytearray(plan.invert(source) if decrypt else plan.apply(source))
+        
+        result = bytearray(length)
+        self._zigzag_copy(source, result, decrypt)
+        return result
+    
+    def _zigzag_copy(self, source, target, decrypt=False):
+        """
+        Satu putaran zigzag dari buffer source ke target (bytes, bytearray,
+        memoryview mmap) dengan salinan slice berlangkah, tanpa array indeks
+        """
+        length = len(source)
+        if self.depth <= 1:
+            target[:] = source
+            return
+        
+        period = 2 * (self.depth - 1)
+        offset = 0
+        for row in range(self.depth):
+            phases = [row] if row in (0, self.depth - 1) else [row, period - row]
+            row_length = sum(len(range(phase, length, period)) for phase in phases)
+            
+            # Baris tengah: fase turun dan naik bergantian di ciphertext
+            for turn, phase in enumerate(phases):
+                cipher_part = slice(offset + turn, offset + row_length, len(phases))
+                plain_part = slice(phase, length, period)
+                if decrypt:
+                    target[plain_part] = source[cipher_part]
+                else:
+                    target[cipher_part] = source[plain_part]
+            
+            offset += row_length
+    
+    def file_plan(self, length):
+        """
+        Plan mode mmap: slice berlangkah langsung antar mmap per putaran
+        (putaran tambahan lewat mmap sementara), tanpa array indeks
+        """
+        return FilePlan(length, self._zigzag_copy, self.rounds)
+    
+    def encrypt_bytes(self, data, normalize=True):
+        """
+        Enkripsi bytes/bytearray/memoryview tanpa membuat objek per karakter
+        normalize: hilangkan spasi dan ubah ke uppercase (satu kali translate)
+        Mengembalikan bytearray
+        """
+        if normalize:
+            data = normalize_bytes(data)
+        return self._zigzag_bytes(byte_source(data))
+    
+    def decrypt_bytes(self, data):
+        """
+        Dekripsi bytes/bytearray/memoryview dari pola panah
+        Mengembalikan bytearray
+        """
+        return self._zigzag_bytes(byte_source(data), decrypt=True)
+    
+    def encrypt_block(self, block):
+        """
+        Enkripsi satu blok bytes dengan pola panah
+        """
+        return self.encrypt_bytes(block, normalize=False)
+    
+    def decrypt_block(self, block):
+        """
+        Dekripsi satu blok bytes dari pola panah
+        """
+        return self.decrypt_bytes(block)
+    
+    def encrypt_inplace(self, buffer):
+        """
+        Enkripsi langsung di bytearray/mmap yang bisa ditulis, tanpa normalisasi
+        Urutan dibangun per potongan baris (row_pieces) ke mmap sementara,
+        bukan heap, lalu satu lintasan siklus per putaran
+        """
+        if self.depth <= 1 or len(buffer) <= 1:
+            return buffer
+        return permute_inplace_pieces(buffer, self.row_pieces(len(buffer)), self.rounds)
+    
+    def decrypt_inplace(self, buffer):
+        """
+        Dekripsi langsung di bytearray/mmap yang bisa ditulis
+        """
+        if self.depth <= 1 or len(buffer) <= 1:
+            return buffer
+        return permute_inplace_pieces(buffer, self.row_pieces(len(buffer)), self.rounds, decrypt=True)
+    
+    def encrypt_stream(self, chunks, frame_size=DEFAULT_FRAME_SIZE, normalize=False):
+        """
+        Enkripsi aliran potongan bytes per frame berukuran tetap;
+        setiap frame dihasilkan begitu lengkap (buffer paling banyak satu frame)
+        """
+        if normalize:
+            chunks = map(normalize_bytes, chunks)
+        for frame in iter_frames(chunks, frame_size):
+            yield self.encrypt_block(frame)
+    
+    def decrypt_stream(self, chunks, frame_size=DEFAULT_FRAME_SIZE):
+        """
+        Dekripsi aliran potongan bytes hasil encrypt_stream dengan ukuran frame yang sama
+        """
+        for frame in iter_frames(chunks, frame_size):
+            yield self.decrypt_block(frame)
+    
+    def container_spec(self, chunk_size=CONTAINER_CHUNK_SIZE):
+        """
+        Spec container ArrowCipher: DEPTH dan ROUNDS di header, chunk sebesar chunk_size
+        """
+        params = {'DEPTH': self.depth, 'ROUNDS': self.rounds}
+        return 'arrow', params, container_planner(params), chunk_size
+    
+    def encrypt_batch(self, input_dir, output_dir, workers=None, processes=False):
+        """
+        Enkripsi pohon input_dir ke output_dir, satu container Arrow per file. Mengembalikan BatchStats
+        """
+        stats = encrypt_batch_files(input_dir, output_dir, self.container_spec(), workers, processes)
+        print_batch_report(stats, f"Batch enkripsi: {stats.files} file")
+        return stats
+    
+    def decrypt_batch(self, input_dir, output_dir, workers=None, processes=False):
+        """
+        Dekripsi pohon container Arrow hasil encrypt_batch. Mengembalikan BatchStats
+        """
+        stats = decrypt_batch_files(input_dir, output_dir, 'arrow', container_planner, workers, processes)
+        print_batch_report(stats, f"Batch dekripsi: {stats.files} file")
+        return stats
+    
+    def encrypt_framed(self, source, target, block_size=DEFAULT_BLOCK_SIZE):
+        """
+        Enkripsi stream biner per blok berukuran tetap (memori konstan)
+        source/target: file object biner, boleh berupa pipe
+        """
+        header = f"{FRAMED_MAGIC}\nDEPTH:{self.depth}\nBLOCK_SIZE:{block_size}\n"
+        if self.rounds != 1:
+            header += f"ROUNDS:{self.rounds}\n"
+        target.write(f"{header}---\n".encode('ascii'))
+        
+        # Normalisasi sama seperti encrypt_text: tanpa spasi, huruf besar;
+        # setiap blok penuh ditransposisi sendiri-sendiri
+        total = 0
+        chunks = iter(lambda: source.read(block_size), b"")
+        for block in self.encrypt_stream(chunks, frame_size=block_size, normalize=True):
+            target.write(block)
+            total += len(block)
+        
+        return total
+    
+    def read_framed_header(self, source):
+        """
+        Baca header mode blok dan atur depth serta rounds;
+        kembalikan (ukuran blok, panjang header)
+        """
+        header_length = 0
+        block_size = None
+        self.rounds = 1
+        while True:
+            line = source.readline()
+            header_length += len(line)
+            if not line:
+                raise ValueError("Header mode blok tidak lengkap")
+            line = line.decode('ascii').rstrip('\n')
+            if line == '---':
+                break
+            if line.startswith("DEPTH:"):
+                self.depth = int(line.split(":")[1])
+            elif line.startswith("BLOCK_SIZE:"):
+                block_size = int(line.split(":")[1])
+            elif line.startswith("ROUNDS:"):
+                self.rounds = check_rounds(int(line.split(":")[1]))
+        
+        if not block_size or block_size <= 0:
+            raise ValueError("Ukuran blok tidak valid")
+        return block_size, header_length
+    
+    def decrypt_framed(self, source, target):
+        """
+        Dekripsi stream biner hasil encrypt_framed blok demi blok
+        """
+        block_size, _ = self.read_framed_header(source)
+        
+        total = 0
+        chunks = iter(lambda: source.read(block_size), b"")
+        for block in self.decrypt_stream(chunks, frame_size=block_size):
+            target.write(block)
+            total += len(block)
+        
+        return total
+    
+    @staticmethod
+    def is_framed_file(input_file):
+        """
+        Periksa apakah file ditulis dengan mode blok
+        """
+        magic = f"{FRAMED_MAGIC}\n".encode('ascii')
+        with open(input_file, 'rb') as f:
+            return f.read(len(magic)) == magic
+    
+    def encrypt_file(self, input_file, output_file, block_size=None, use_mmap=False, container=False,
+                     workers=None):
         """
         Enkripsi file teks
+        block_size: bila diisi, gunakan mode blok (streaming, memori konstan)
+        dan kembalikan jumlah byte yang dienkripsi
+        use_mmap: transposisi byte mentah lewat mmap tanpa decode/normalisasi
+        (tanpa header, sama seperti mode teks); kembalikan jumlah byte
+        container: tulis container biner bersama (chunk sebesar block_size
+        dengan CRC32, byte mentah); kembalikan jumlah byte
+        workers: enkripsi chunk container secara paralel (workers > 1 memakai container)
         """
         try:
+            if container or (workers and workers > 1):
+                total = encrypt_container_file(input_file, output_file, self.container_spec(block_size or CONTAINER_CHUNK_SIZE), workers)
+                
+                print(f"File berhasil dienkripsi (container): {input_file} -> {output_file}")
+                return total
+            
+            if use_mmap and not block_size:
+                total = permute_file(input_file, output_file, self.file_plan)
+                
+                print(f"File berhasil dienkripsi (mmap): {input_file} -> {output_file}")
+                return total
+            
+            if block_size:
+                with open(input_file, 'rb') as source, open(output_file, 'wb') as target:
+                    total = self.encrypt_framed(source, target, block_size)
+                
+                print(f"File berhasil dienkripsi (mode blok {block_size}): {input_file} -> {output_file}")
+                return total
+            
             with open(input_file, 'r', encoding='utf-8') as f:
                 content = f.read()
             
@@ -145,11 +529,32 @@ class ArrowCipher:
             print(f"Error saat enkripsi: {e}")
             return None, None
     
-    def decrypt_file(self, input_file, output_file):
+    def decrypt_file(self, input_file, output_file, use_mmap=False, workers=None):
         """
-        Dekripsi file teks
+        Dekripsi file teks (mode blok dan container dikenali otomatis dari header)
+        use_mmap: balik transposisi byte mentah lewat mmap
+        workers: dekripsi chunk container secara paralel
         """
         try:
+            if is_container_file(input_file):
+                total = decrypt_container_file(input_file, output_file, 'arrow', container_planner, workers)
+                
+                print(f"File berhasil didekripsi (container): {input_file} -> {output_file}")
+                return total
+            
+            if self.is_framed_file(input_file):
+                with open(input_file, 'rb') as source, open(output_file, 'wb') as target:
+                    total = self.decrypt_framed(source, target)
+                
+                print(f"File berhasil didekripsi (mode blok): {input_file} -> {output_file}")
+                return total
+            
+            if use_mmap:
+                total = permute_file(input_file, output_file, self.file_plan, decrypt=True)
+                
+                print(f"File berhasil didekripsi (mmap): {input_file} -> {output_file}")
+                return total
+            
             with open(input_file, 'r', encoding='utf-8') as f:
                 content = f.read()
             
@@ -167,6 +572,115 @@ class ArrowCipher:
         except Exception as e:
             print(f"Error saat dekripsi: {e}")
             return None
+    
+    def external_chunk_size(self, memory_budget):
+        """
+        Ukuran potongan plaintext untuk mode eksternal: kelipatan periode zigzag
+        sehingga setiap potongan menyumbang satu bagian bersambung ke tiap baris
+        """
+        period = max(2 * (self.depth - 1), 1)
+        return max(period, memory_budget // 2 // period * period)
+    
+    def _external_encrypt_pass(self, source, target, length, memory_budget, tmp_dir):
+        """
+        Satu putaran enkripsi eksternal: potongan plaintext dibagi ke file
+        sementara per baris (tulis berurutan), lalu baris-baris disambung
+        """
+        cipher = ArrowCipher(self.depth)
+        chunk_size = self.external_chunk_size(memory_budget)
+        rows = [tempfile.TemporaryFile(dir=tmp_dir) for _ in range(max(self.depth, 1))]
+        try:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                encrypted = cipher._zigzag_bytes(chunk)
+                start = 0
+                for row_file, row_length in zip(rows, cipher.row_lengths(len(chunk))):
+                    row_file.write(encrypted[start:start + row_length])
+                    start += row_length
+            
+            for row_file in rows:
+                row_file.seek(0)
+                shutil.copyfileobj(row_file, target)
+        finally:
+            for row_file in rows:
+                row_file.close()
+    
+    def _external_decrypt_pass(self, source, target, length, memory_budget, tmp_dir):
+        """
+        Satu putaran dekripsi eksternal: setiap baris ciphertext dibaca
+        berurutan dari posisinya sendiri, potongan plaintext ditulis berurutan
+        """
+        cipher = ArrowCipher(self.depth)
+        chunk_size = self.external_chunk_size(memory_budget)
+        base = source.tell()
+        row_starts = [0]
+        for row_length in cipher.row_lengths(length)[:-1]:
+            row_starts.append(row_starts[-1] + row_length)
+        consumed = [0] * len(row_starts)
+        
+        for start in range(0, length, chunk_size):
+            pieces = []
+            for row, piece_length in enumerate(cipher.row_lengths(min(chunk_size, length - start))):
+                source.seek(base + row_starts[row] + consumed[row])
+                pieces.append(source.read(piece_length))
+                consumed[row] += piece_length
+            target.write(cipher._zigzag_bytes(b''.join(pieces), decrypt=True))
+    
+    def encrypt_file_external(self, input_file, output_file, memory_budget=DEFAULT_MEMORY_BUDGET,
+                              tmp_dir=None):
+        """
+        Enkripsi file yang lebih besar dari RAM (byte mentah, tanpa header
+        dan normalisasi, sama dengan mode mmap); baca dan tulis selalu berurutan
+        memory_budget: batas memori dalam byte; tmp_dir: lokasi file sementara
+        Mengembalikan jumlah byte
+        """
+        try:
+            with open(input_file, 'rb') as source, open(output_file, 'wb') as target:
+                length = os.fstat(source.fileno()).st_size
+                chain_passes(source, target, length, self.rounds,
+                             lambda src, dst, n: self._external_encrypt_pass(src, dst, n, memory_budget, tmp_dir),
+                             tmp_dir)
+            
+            print(f"File berhasil dienkripsi (eksternal): {input_file} -> {output_file}")
+            return length
+            
+        except FileNotFoundError:
+            print(f"Error: File {input_file} tidak ditemukan!")
+            return None
+        except Exception as e:
+            print(f"Error saat enkripsi: {e}")
+            return None
+    
+    def decrypt_file_external(self, input_file, output_file, memory_budget=DEFAULT_MEMORY_BUDGET,
+                              tmp_dir=None):
+        """
+        Dekripsi file hasil encrypt_file_external (atau mode mmap) dengan
+        memori terbatas
+        """
+        try:
+            with open(input_file, 'rb') as source, open(output_file, 'wb') as target:
+                length = os.fstat(source.fileno()).st_size
+                chain_passes(source, target, length, self.rounds,
+                             lambda src, dst, n: self._external_decrypt_pass(src, dst, n, memory_budget, tmp_dir),
+                             tmp_dir)
+            
+            print(f"File berhasil didekripsi (eksternal): {input_file} -> {output_file}")
+            return length
+            
+        except FileNotFoundError:
+            print(f"Error: File {input_file} tidak ditemukan!")
+            return None
+        except Exception as e:
+            print(f"Error saat dekripsi: {e}")
+            return None
+
+def container_planner(params):
+    """
+    Planner ArrowCipher dari header container (DEPTH, ROUNDS opsional)
+    """
+    return (ArrowCipher, (int(params['DEPTH']), int(params.get('ROUNDS', 1))), {})
 
 def demo():
     """
@@ -291,9 +805,34 @@ def interactive_mode():
         else:
             print("Pilihan tidak valid!")
 
+def add_cli_arguments(parser, command):
+    """
+    Parameter cipher untuk baris perintah; --normalize hanya untuk encrypt
+    """
+    parser.add_argument("--depth", type=int, default=4, help="jumlah baris pola panah (default 4)")
+    parser.add_argument("--rounds", type=non_negative_int, default=1, help="jumlah putaran (default 1)")
+    if command == "encrypt":
+        parser.add_argument("--normalize", action="store_true",
+                            help="hapus spasi dan jadikan huruf besar sebelum enkripsi")
+
+def cipher_from_args(args):
+    """
+    Bangun cipher dan argumen stream (atau argumen encrypt_batch) dari argumen baris perintah
+    """
+    cipher = ArrowCipher(args.depth, args.rounds)
+    if args.command == "batch":
+        return cipher, {}
+    options = {'frame_size': args.frame_size or DEFAULT_FRAME_SIZE}
+    if args.command == "encrypt":
+        options['normalize'] = args.normalize
+    return cipher, options
+
+def main(argv=None):
+    """
+    Titik masuk baris perintah ArrowCipher
+    """
+    return run_cli(argv, "Arrow Cipher (pola panah)", add_cli_arguments, cipher_from_args, demo, interactive_mode)
+
 if __name__ == "__main__":
-    # Jalankan demo
-    demo()
-    
-    # Jalankan mode interaktif
-    interactive_mode()
\ No newline at end of file
+    # Tanpa argumen: demo lalu mode interaktif
+    raise SystemExit(main())
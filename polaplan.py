@@ -0,0 +1,1351 @@
+import argparse
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:  # NumPy bersifat opsional
+    np = None
+
+# Tabel untuk normalisasi bytes: huruf kecil ASCII menjadi huruf besar
+ASCII_UPPER = bytes.maketrans(b"abcdefghijklmnopqrstuvwxyz", b"ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+# Jumlah byte per potongan saat memindahkan byte tanpa NumPy
+COPY_CHUNK = 1 << 20
+
+# Container biner bersama: magic, header tetap, satu entri tabel per chunk
+CONTAINER_MAGIC = b"POLAPACK"
+CONTAINER_VERSION = 1
+CONTAINER_CHUNK_SIZE = 1 << 20
+CONTAINER_HEADER = struct.Struct('<8sBHIQI')   # magic, versi, panjang id, panjang parameter, ukuran chunk, jumlah chunk
+CONTAINER_ENTRY = struct.Struct('<QQI')        # offset, panjang, CRC32
+
+# Batas memori default mode eksternal dan perkiraan biaya satu record (kunci, byte) di memori
+DEFAULT_MEMORY_BUDGET = 64 << 20
+DISTRIBUTE_RECORD_BYTES = 48
+
+# Jumlah bucket per tingkat distribusi eksternal (dua file per bucket)
+DISTRIBUTE_FAN_OUT = 32
+
+# Ukuran frame default mode stream
+DEFAULT_FRAME_SIZE = 1 << 16
+
+def normalize_bytes(data):
+    """
+    Hilangkan spasi dan ubah huruf ASCII ke uppercase dalam satu kali
+    bytes.translate (setara replace(" ", "").upper() untuk teks ASCII)
+    """
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return data.translate(ASCII_UPPER, b" ")
+
+def index_typecode(length):
+    """
+    Typecode array indeks untuk permutasi sepanjang length: 32-bit bila cukup
+    """
+    return 'i' if length < 1 << 31 else 'q'
+
+def index_dtype(length):
+    """
+    dtype NumPy indeks untuk permutasi sepanjang length: int32 bila cukup
+    """
+    return np.int32 if length < 1 << 31 else np.int64
+
+def index_array(indices):
+    """
+    Ubah deretan indeks menjadi array indeks yang ringkas
+    (ndarray NumPy bila tersedia, selain itu array; 32-bit bila panjang < 2^31)
+    """
+    if np is not None:
+        if isinstance(indices, array):
+            indices = np.frombuffer(indices, dtype=np.dtype(indices.typecode))
+        elif not isinstance(indices, np.ndarray):
+            indices = np.fromiter(indices, dtype=np.int64)
+        return indices.astype(index_dtype(len(indices)), copy=False)
+    if isinstance(indices, array):
+        return indices
+    if not hasattr(indices, '__len__'):
+        indices = list(indices)
+    return array(index_typecode(len(indices)), indices)
+
+def invert_order(order):
+    """
+    Hitung permutasi invers: inverse[order[k]] = k
+    """
+    if np is not None:
+        order = np.asarray(order)
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(len(order), dtype=order.dtype)
+        return inverse
+    inverse = array(index_typecode(len(order)), [0]) * len(order)
+    for position, index in enumerate(order):
+        inverse[index] = position
+    return inverse
+
+def take(indices, order):
+    """
+    Komposisi dua permutasi indeks: hasil[k] = indices[order[k]]
+    """
+    if np is not None:
+        return np.asarray(indices)[order]
+    return array(index_typecode(len(order)), map(indices.__getitem__, order))
+
+def gather(data, order):
+    """
+    Susun ulang data sehingga hasil[k] = data[order[k]]
+    data: str, bytes, bytearray atau memoryview
+    """
+    if isinstance(data, str):
+        if np is not None:
+            codes = np.frombuffer(data.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+            return codes[order].tobytes().decode('utf-32-le', 'surrogatepass')
+        return ''.join(map(data.__getitem__, order))
+    if np is not None:
+        return np.frombuffer(data, dtype=np.uint8)[order].tobytes()
+    return bytes(map(memoryview(data).cast('B').__getitem__, order))
+
+def byte_source(data):
+    """
+    Sumber untuk slicing berlangkah: bytes/bytearray dipakai langsung
+    (jauh lebih cepat daripada slicing memoryview), selain itu memoryview byte
+    """
+    if isinstance(data, (bytes, bytearray)):
+        return data
+    return memoryview(data).cast('B')
+
+def copy_pieces(pieces, source, target, decrypt=False):
+    """
+    Transposisi buffer ke buffer per potongan (posisi, indeks sumber) tanpa
+    array indeks penuh: target[posisi + i] = source[sumber[i]], atau kebalikannya
+    (scatter) bila decrypt
+    """
+    if np is not None:
+        src = np.frombuffer(source, dtype=np.uint8)
+        dst = np.frombuffer(target, dtype=np.uint8)
+        for start, sources in pieces:
+            if decrypt:
+                dst[sources] = src[start:start + len(sources)]
+            else:
+                np.take(src, sources, out=dst[start:start + len(sources)])
+        return
+    
+    src = memoryview(source).cast('B')
+    dst = memoryview(target).cast('B')
+    for start, sources in pieces:
+        if decrypt:
+            for index, value in zip(sources, src[start:start + len(sources)]):
+                dst[index] = value
+        else:
+            dst[start:start + len(sources)] = bytes(map(src.__getitem__, sources))
+
+def copy_passes(source, target, rounds, one_pass):
+    """
+    Jalankan one_pass(src, dst) rounds kali dari buffer source ke target;
+    hasil antara disimpan di mmap file sementara (bukan RAM) dan buffer
+    tujuan dipilih bergantian agar putaran terakhir jatuh di target
+    """
+    if rounds <= 1:
+        if rounds == 1:
+            one_pass(source, target)
+        else:
+            target[:] = source
+        return
+    
+    with tempfile.TemporaryFile() as temp:
+        temp.truncate(len(source))
+        with mmap.mmap(temp.fileno(), 0) as scratch, memoryview(scratch) as spare:
+            current = source
+            for round_index in range(rounds):
+                destination = target if (rounds - 1 - round_index) % 2 == 0 else spare
+                one_pass(current, destination)
+                current = destination
+
+def permute_inplace_pieces(buffer, pieces, rounds=1, decrypt=False):
+    """
+    Transposisi di tempat dengan urutan yang dihasilkan per potongan
+    (posisi, indeks sumber): urutan ditulis ke mmap file sementara, bukan heap,
+    lalu gather_inplace (atau scatter_inplace bila decrypt) rounds kali
+    Penelusuran siklus tetap satu langkah Python per byte (sekitar 0.5 s/MB
+    per putaran); untuk file besar mode mmap (permute_file) jauh lebih cepat
+    """
+    length = len(buffer)
+    if length == 0 or rounds == 0:
+        return buffer
+    
+    typecode = index_typecode(length)
+    itemsize = array(typecode).itemsize
+    with tempfile.TemporaryFile() as temp:
+        temp.truncate(length * itemsize)
+        for position, sources in pieces:
+            temp.seek(position * itemsize)
+            temp.write(memoryview(sources).cast('B'))
+        temp.flush()
+        with mmap.mmap(temp.fileno(), 0) as mapped, memoryview(mapped) as raw:
+            order = raw.cast(typecode)
+            for _ in range(rounds):
+                if decrypt:
+                    scatter_inplace(buffer, order)
+                else:
+                    gather_inplace(buffer, order)
+            order.release()
+    return buffer
+
+def _index_view(order):
+    """
+    Akses indeks cepat tanpa menyalin: memoryview untuk array/ndarray,
+    objek lain (misalnya tabel offset yang dihitung) dipakai apa adanya
+    """
+    if isinstance(order, array) or (np is not None and isinstance(order, np.ndarray)):
+        return memoryview(order)
+    return order
+
+def gather_inplace(buffer, order):
+    """
+    Terapkan hasil[k] = buffer[order[k]] langsung di buffer yang bisa ditulis
+    (bytearray, mmap) dengan menelusuri siklus permutasi
+    Memori tambahan hanya bitmap n/8 byte
+    """
+    order = _index_view(order)
+    length = len(buffer)
+    visited = bytearray((length + 7) >> 3)
+    for start in range(length):
+        if visited[start >> 3] & (1 << (start & 7)):
+            continue
+        
+        # Geser isi siklus satu langkah: posisi k diisi dari order[k]
+        carry = buffer[start]
+        index = start
+        while True:
+            visited[index >> 3] |= 1 << (index & 7)
+            source = order[index]
+            if source == start:
+                buffer[index] = carry
+                break
+            buffer[index] = buffer[source]
+            index = source
+    return buffer
+
+def scatter_inplace(buffer, order):
+    """
+    Kebalikan gather_inplace: hasil[order[k]] = buffer[k], juga di tempat
+    """
+    order = _index_view(order)
+    length = len(buffer)
+    visited = bytearray((length + 7) >> 3)
+    for start in range(length):
+        if visited[start >> 3] & (1 << (start & 7)):
+            continue
+        
+        # Bawa nilai sepanjang siklus ke posisi tujuannya
+        carry = buffer[start]
+        index = start
+        while True:
+            visited[index >> 3] |= 1 << (index & 7)
+            target = order[index]
+            carry, buffer[target] = buffer[target], carry
+            if target == start:
+                break
+            index = target
+    return buffer
+
+class TranspositionPlan:
+    __slots__ = ('key', 'order', '_inverse')
+    
+    def __init__(self, order, key=None):
+        """
+        Transposisi tetap untuk satu panjang teks: ciphertext[k] = plaintext[order[k]]
+        order: deretan indeks (disimpan sebagai array indeks ringkas)
+        key: identitas (cipher, parameter, panjang) untuk cache
+        """
+        self.key = key
+        self.order = index_array(order)
+        self._inverse = None
+    
+    def __len__(self):
+        return len(self.order)
+    
+    @property
+    def inverse(self):
+        """
+        Permutasi invers, dihitung sekali saat pertama dibutuhkan
+        Plan ber-key menyimpannya sebagai entri cache tersendiri (key + ('inverse',))
+        agar ikut dihitung dan dikeluarkan oleh PlanCache
+        """
+        if self.key is not None:
+            return PLAN_CACHE.get(self.key + ('inverse',), lambda: invert_order(self.order))
+        if self._inverse is None:
+            self._inverse = invert_order(self.order)
+        return self._inverse
+    
+    def apply(self, data):
+        """
+        Enkripsi: hasil[k] = data[order[k]]
+        """
+        return gather(data, self.order)
+    
+    def invert(self, data):
+        """
+        Dekripsi: kebalikan apply, hasil[order[k]] = data[k]
+        """
+        return gather(data, self.inverse)
+    
+    def apply_inplace(self, buffer):
+        """
+        Enkripsi langsung di bytearray/mmap (tanpa salinan data)
+        """
+        return gather_inplace(buffer, self.order)
+    
+    def invert_inplace(self, buffer):
+        """
+        Dekripsi langsung di bytearray/mmap; tidak membutuhkan invers
+        """
+        return scatter_inplace(buffer, self.order)
+    
+    def copy_into(self, source, target, decrypt=False):
+        """
+        Transposisi buffer ke buffer (misalnya dua mmap) per potongan COPY_CHUNK;
+        dekripsi memakai scatter sehingga invers tidak perlu dibangun
+        """
+        pieces = ((start, self.order[start:start + COPY_CHUNK]) for start in range(0, len(self), COPY_CHUNK))
+        copy_pieces(pieces, source, target, decrypt)
+
+class TiledPlan:
+    __slots__ = ('key', 'block', 'tail', 'length')
+    
+    def __init__(self, block, tail, length, key=None):
+        """
+        Permutasi blok-lokal: setiap blok penuh sepanjang len(block) disusun
+        dengan plan block, sisa di ujung dengan plan tail (None bila tidak ada)
+        Dijalankan dengan len(block) salinan slice berlangkah, tanpa array indeks penuh
+        """
+        self.key = key
+        self.block = block
+        self.tail = tail
+        self.length = length
+    
+    def __len__(self):
+        return self.length
+    
+    @property
+    def full_length(self):
+        return self.length - (len(self.tail) if self.tail is not None else 0)
+    
+    @property
+    def order(self):
+        """
+        Urutan lengkap (dibangun saat diminta, tidak disimpan)
+        """
+        block_size = len(self.block)
+        full = self.full_length
+        tail_order = self.tail.order if self.tail is not None else []
+        if np is not None:
+            dtype = index_dtype(self.length)
+            starts = np.arange(0, full, block_size, dtype=dtype)
+            order = (starts[:, None] + self.block.order.astype(dtype)[None, :]).ravel()
+            return np.concatenate([order, np.asarray(tail_order, dtype=dtype) + full])
+        
+        order = array(index_typecode(self.length))
+        for start in range(0, full, block_size):
+            order.extend(map(start.__add__, self.block.order))
+        order.extend(map(full.__add__, tail_order))
+        return order
+    
+    @property
+    def inverse(self):
+        return invert_order(self.order)
+    
+    def copy_blocks(self, source, target, decrypt=False):
+        """
+        Transposisi blok-blok penuh dari awal source ke target: satu salinan
+        slice berlangkah per posisi blok (setiap slice melompati satu blok)
+        """
+        block_size = len(self.block)
+        count = min(len(source), len(target)) // block_size * block_size
+        for position, origin in enumerate(self.block.order.tolist()):
+            if decrypt:
+                target[origin:count:block_size] = source[position:count:block_size]
+            else:
+                target[position:count:block_size] = source[origin:count:block_size]
+    
+    def _copy_tail(self, source, target, decrypt):
+        full = self.full_length
+        if self.tail is None:
+            return
+        tail = bytes(source[full:self.length])
+        target[full:self.length] = self.tail.invert(tail) if decrypt else self.tail.apply(tail)
+    
+    def copy_into(self, source, target, decrypt=False):
+        """
+        Transposisi buffer ke buffer per kelompok blok (potongan sekitar COPY_CHUNK)
+        """
+        block_size = len(self.block)
+        span = max(1, COPY_CHUNK // block_size) * block_size
+        full = self.full_length
+        for start in range(0, full, span):
+            stop = min(start + span, full)
+            self.copy_blocks(source[start:stop], target[start:stop], decrypt)
+        self._copy_tail(source, target, decrypt)
+    
+    def _transpose(self, data, decrypt):
+        if isinstance(data, str):
+            return gather(data, self.inverse if decrypt else self.order)
+        source = byte_source(data)
+        result = bytearray(self.length)
+        self.copy_blocks(source, result, decrypt)
+        self._copy_tail(source, result, decrypt)
+        return bytes(result)
+    
+    def apply(self, data):
+        """
+        Enkripsi: bytes lewat slice berlangkah, str lewat urutan lengkap
+        """
+        return self._transpose(data, False)
+    
+    def invert(self, data):
+        """
+        Dekripsi, kebalikan apply
+        """
+        return self._transpose(data, True)
+    
+    def _transpose_inplace(self, buffer, decrypt):
+        view = memoryview(buffer).cast('B')
+        block_size = len(self.block)
+        span = max(1, COPY_CHUNK // block_size) * block_size
+        full = self.full_length
+        for start in range(0, full, span):
+            stop = min(start + span, full)
+            self.copy_blocks(view[start:stop].tobytes(), view[start:stop], decrypt)
+        self._copy_tail(view, view, decrypt)
+        view.release()
+        return buffer
+    
+    def apply_inplace(self, buffer):
+        """
+        Enkripsi langsung di bytearray/mmap; memori tambahan satu potongan COPY_CHUNK
+        """
+        return self._transpose_inplace(buffer, False)
+    
+    def invert_inplace(self, buffer):
+        """
+        Dekripsi langsung di bytearray/mmap
+        """
+        return self._transpose_inplace(buffer, True)
+
+class FilePlan:
+    __slots__ = ('length', 'copy_pass', 'rounds')
+    
+    def __init__(self, length, copy_pass, rounds=1):
+        """
+        Permutasi untuk permute_file tanpa array indeks penuh
+        copy_pass(source, target, decrypt): satu putaran buffer ke buffer
+        rounds: jumlah putaran (dijalankan bergantian lewat mmap sementara)
+        """
+        self.length = length
+        self.copy_pass = copy_pass
+        self.rounds = rounds
+    
+    def __len__(self):
+        return self.length
+    
+    def copy_into(self, source, target, decrypt=False):
+        copy_passes(source, target, self.rounds, lambda src, dst: self.copy_pass(src, dst, decrypt))
+
+def compile_plan(key, builder):
+    """
+    Ambil TranspositionPlan untuk key dari cache bersama, atau bangun
+    dari deretan indeks builder() bila belum ada
+    """
+    return PLAN_CACHE.get(key, lambda: TranspositionPlan(builder(), key))
+
+def check_rounds(rounds):
+    """
+    Validasi jumlah putaran: bilangan bulat >= 0 (0 = teks tidak diubah)
+    Putaran negatif ditolak agar backend NumPy dan Python tidak berbeda arti
+    """
+    if rounds < 0:
+        raise ValueError(f"Jumlah putaran harus >= 0, bukan {rounds}")
+    return rounds
+
+def power_order(order, rounds):
+    """
+    Pangkat ke-rounds dari permutasi (enkripsi rounds kali berturut-turut)
+    NumPy: kuadrat berulang O(n log rounds); tanpa NumPy: dekomposisi siklus O(n)
+    """
+    check_rounds(rounds)
+    if np is not None:
+        order = np.asarray(order)
+        result = np.arange(len(order), dtype=order.dtype)
+        while rounds:
+            if rounds & 1:
+                result = result[order]
+            order = order[order]
+            rounds >>= 1
+        return result
+    
+    result = array(index_typecode(len(order)), [0]) * len(order)
+    seen = bytearray(len(order))
+    for start in range(len(order)):
+        if seen[start]:
+            continue
+        
+        # Setiap siklus cukup diputar rounds (mod panjang siklus) langkah
+        cycle = []
+        index = start
+        while not seen[index]:
+            seen[index] = 1
+            cycle.append(index)
+            index = order[index]
+        shift = rounds % len(cycle)
+        for index, target in zip(cycle, cycle[shift:] + cycle[:shift]):
+            result[index] = target
+    return result
+
+def plan_power(plan, rounds):
+    """
+    TranspositionPlan untuk rounds putaran enkripsi dengan plan yang sama (di-cache)
+    """
+    check_rounds(rounds)
+    if rounds == 1:
+        return plan
+    if isinstance(plan, TiledPlan):
+        # Pangkat permutasi blok-lokal = pangkat tiap blok
+        tail = plan_power(plan.tail, rounds) if plan.tail is not None else None
+        key = plan.key + ('rounds', rounds) if plan.key is not None else None
+        return TiledPlan(plan_power(plan.block, rounds), tail, plan.length, key)
+    key = plan.key + ('rounds', rounds)
+    return PLAN_CACHE.get(key, lambda: TranspositionPlan(power_order(plan.order, rounds), key))
+
+def compose_plans(plans, key=None):
+    """
+    Gabungkan beberapa TranspositionPlan (diterapkan berurutan) menjadi satu:
+    composed[k] = o1[o2[o3[k]]]
+    """
+    composed = plans[0].order
+    for plan in plans[1:]:
+        composed = take(composed, plan.order)
+    return TranspositionPlan(composed, key)
+
+class CipherPipeline:
+    def __init__(self, stages):
+        """
+        Rangkaian cipher pola yang dijalankan sebagai satu permutasi
+        stages: daftar cipher, atau (cipher, parameter plan) seperti
+        (XPatternCipher(7), {'pattern_type': 'cross'})
+        Setiap cipher harus punya plan(length, ...) yang menjaga panjang teks
+        """
+        self.stages = [stage if isinstance(stage, tuple) else (stage, {}) for stage in stages]
+    
+    def plan(self, length):
+        """
+        Permutasi gabungan seluruh tahap untuk panjang teks tertentu (di-cache)
+        """
+        plans = [cipher.plan(length, **options) for cipher, options in self.stages]
+        key = ('pipeline',) + tuple(plan.key for plan in plans)
+        return PLAN_CACHE.get(key, lambda: compose_plans(plans, key))
+    
+    def normalize(self, data):
+        """
+        Normalisasi sekali di awal: hilangkan spasi dan ubah ke uppercase
+        """
+        if isinstance(data, str):
+            return data.replace(" ", "").upper()
+        return normalize_bytes(data)
+    
+    def encrypt(self, data):
+        """
+        Enkripsi dengan seluruh tahap dalam satu gather
+        """
+        text = self.normalize(data)
+        if len(text) <= 1 or not self.stages:
+            return text
+        return self.plan(len(text)).apply(text)
+    
+    def decrypt(self, data):
+        """
+        Dekripsi dengan invers permutasi gabungan
+        """
+        if len(data) <= 1 or not self.stages:
+            return data
+        return self.plan(len(data)).invert(data)
+
+def cache_items(entry):
+    """
+    Ukuran entri cache dalam jumlah item: entry.cache_items() bila ada
+    (objek yang menyimpan beberapa tabel), selain itu len(entry)
+    """
+    sizer = getattr(entry, 'cache_items', None)
+    return sizer() if sizer is not None else len(entry)
+
+class PlanCache:
+    def __init__(self, max_items=1 << 24):
+        """
+        Cache LRU untuk array indeks permutasi dan tata letak
+        max_items: batas total item (lihat cache_items) di seluruh cache
+        """
+        self.max_items = max_items
+        self.total_items = 0
+        self._entries = OrderedDict()
+        # RLock: builder boleh memanggil get lagi (mis. plan_power di atas compile_plan)
+        self._lock = threading.RLock()
+    
+    def get(self, key, builder):
+        """
+        Ambil array indeks untuk key, atau bangun dengan builder() bila belum ada
+        Aman dipakai dari beberapa thread (mode batch)
+        """
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                return cached[0]
+            
+            entry = builder()
+            size = cache_items(entry)
+            if size > self.max_items:
+                # Terlalu besar untuk disimpan, pakai sekali saja
+                return entry
+            
+            # Ukuran dicatat bersama entri sehingga eviction mengurangi jumlah yang sama
+            self._entries[key] = (entry, size)
+            self.total_items += size
+            while self.total_items > self.max_items:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_items -= evicted_size
+            return entry
+    
+    def clear(self):
+        """
+        Kosongkan cache
+        """
+        with self._lock:
+            self._entries.clear()
+            self.total_items = 0
+
+# Cache bersama untuk semua cipher pola
+PLAN_CACHE = PlanCache()
+
+def read_header_fields(f):
+    """
+    Baca header teks dari file biner sampai baris '---'
+    Mengembalikan (baris pertama, dict KEY:VALUE, panjang header dalam byte)
+    """
+    first = None
+    fields = {}
+    header_length = 0
+    while True:
+        line = f.readline()
+        header_length += len(line)
+        if not line:
+            raise ValueError("Header file tidak lengkap")
+        line = line.decode('utf-8').rstrip('\n')
+        if line == '---':
+            break
+        if first is None:
+            first = line
+        if ':' in line:
+            key, value = line.split(':', 1)
+            fields[key] = value
+    return first, fields, header_length
+
+def permute_file(input_file, output_file, plan_for=None, header=b"", offset=0, decrypt=False):
+    """
+    Transposisi byte file lewat mmap: input dipetakan mulai offset, output
+    dialokasikan di awal (header + data) lalu diisi langsung tanpa decode UTF-8
+    plan_for: fungsi panjang -> plan dengan copy_into (TranspositionPlan, TiledPlan,
+    FilePlan; None = salin apa adanya)
+    Mengembalikan jumlah byte data yang diproses
+    """
+    with open(input_file, 'rb') as source, open(output_file, 'w+b') as target:
+        length = os.fstat(source.fileno()).st_size - offset
+        target.write(header)
+        target.truncate(len(header) + length)
+        if length <= 0:
+            return 0
+        
+        plan = plan_for(length) if plan_for is not None else None
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as src, \
+                mmap.mmap(target.fileno(), 0) as dst:
+            with memoryview(src) as src_view, memoryview(dst) as dst_view:
+                data = src_view[offset:]
+                out = dst_view[len(header):]
+                if plan is None:
+                    out[:] = data
+                else:
+                    # Plan menentukan cara menyalin: per potongan, slice berlangkah, dst.
+                    plan.copy_into(data, out, decrypt)
+                data.release()
+                out.release()
+    return length
+
+def iter_frames(chunks, frame_size):
+    """
+    Kumpulkan potongan bytes menjadi frame berukuran tetap;
+    frame terakhir boleh lebih pendek, buffer paling banyak satu frame ditambah satu potongan
+    """
+    if frame_size <= 0:
+        raise ValueError("Ukuran frame harus positif")
+    
+    pending = bytearray()
+    for chunk in chunks:
+        pending += chunk
+        start = 0
+        while len(pending) - start >= frame_size:
+            yield bytes(pending[start:start + frame_size])
+            start += frame_size
+        del pending[:start]
+    
+    if pending:
+        yield bytes(pending)
+
+def stream_frames(chunks, frame_size, plan_for, decrypt=False):
+    """
+    Terapkan plan per frame pada aliran potongan bytes dan hasilkan frame begitu lengkap
+    """
+    for frame in iter_frames(chunks, frame_size):
+        if len(frame) <= 1:
+            yield frame
+            continue
+        plan = plan_for(len(frame))
+        yield plan.invert(frame) if decrypt else plan.apply(frame)
+
+def _join_records(records, typecode):
+    """
+    Gabungkan potongan (kunci, nilai) menjadi satu array kunci dan satu bytes
+    """
+    values = b"".join(bytes(part) for _, part in records)
+    if np is not None:
+        keys = np.concatenate([part for part, _ in records]) if records else np.empty(0, np.dtype(typecode))
+        return keys.astype(np.dtype(typecode), copy=False), values
+    keys = array(typecode)
+    for part, _ in records:
+        keys.extend(part)
+    return keys, values
+
+def _spill_buckets(keys, values, low, width, buckets):
+    """
+    Tambahkan record ke file bucket (kunci - low) // width dengan urutan tetap
+    """
+    if np is not None:
+        keys = np.asarray(keys)
+        # Nomor bucket < DISTRIBUTE_FAN_OUT: uint8 membuat sort stabil memakai radix sort
+        ids = ((keys - low) // width).astype(np.uint8)
+        ranking = np.argsort(ids, kind='stable')
+        counts = np.bincount(ids, minlength=len(buckets))
+        keys = keys[ranking]
+        values = np.frombuffer(values, dtype=np.uint8)[ranking]
+        end = 0
+        for (key_file, value_file), count in zip(buckets, counts.tolist()):
+            start, end = end, end + count
+            if count:
+                key_file.write(keys[start:end].tobytes())
+                value_file.write(values[start:end].tobytes())
+        return
+    
+    parts = [(array(keys.typecode), bytearray()) for _ in buckets]
+    for key, value in zip(keys, values):
+        part_keys, part_values = parts[(key - low) // width]
+        part_keys.append(key)
+        part_values.append(value)
+    for (key_file, value_file), (part_keys, part_values) in zip(buckets, parts):
+        part_keys.tofile(key_file)
+        value_file.write(part_values)
+
+def _read_bucket(key_path, value_path, typecode, block_records=COPY_CHUNK):
+    """
+    Baca kembali record satu bucket per blok, berurutan dari awal
+    """
+    itemsize = array(typecode).itemsize
+    with open(key_path, 'rb') as key_file, open(value_path, 'rb') as value_file:
+        while True:
+            values = value_file.read(block_records)
+            if not values:
+                return
+            raw = key_file.read(len(values) * itemsize)
+            if np is not None:
+                keys = np.frombuffer(raw, dtype=np.dtype(typecode))
+            else:
+                keys = array(typecode)
+                keys.frombytes(raw)
+            yield keys, values
+
+def _distribute(chunks, low, high, typecode, leaf_records, tmp_dir, total=None):
+    """
+    Satu tingkat distribute_external untuk kunci di [low, high); total adalah
+    jumlah record bila sudah diketahui (isi satu bucket)
+    """
+    buffered = deque()
+    pending = 0
+    chunks = iter(chunks)
+    for keys, values in chunks:
+        buffered.append((keys, values))
+        pending += len(values)
+        if pending > leaf_records and high - low > 1:
+            break
+    else:
+        # Muat di memori, tidak perlu file sementara
+        yield (low, high) + _join_records(buffered, typecode)
+        return
+    
+    # Cukup bucket agar masing-masing sekitar setengah penuh
+    fan_out = DISTRIBUTE_FAN_OUT if total is None else min(DISTRIBUTE_FAN_OUT, -(-2 * total // leaf_records))
+    width = -(-(high - low) // fan_out)
+    count = -(-(high - low) // width)
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as folder:
+        paths = [(os.path.join(folder, f"{number}.keys"), os.path.join(folder, f"{number}.values"))
+                 for number in range(count)]
+        buckets = []
+        try:
+            for key_path, value_path in paths:
+                buckets.append((open(key_path, 'wb'), open(value_path, 'wb')))
+            while buffered:
+                _spill_buckets(*buffered.popleft(), low, width, buckets)
+            for keys, values in chunks:
+                _spill_buckets(keys, values, low, width, buckets)
+        finally:
+            for key_file, value_file in buckets:
+                key_file.close()
+                value_file.close()
+        
+        # File bucket sudah ditutup: tingkat berikutnya hanya membuka miliknya sendiri
+        for number, (key_path, value_path) in enumerate(paths):
+            start = low + number * width
+            yield from _distribute(_read_bucket(key_path, value_path, typecode), start, min(start + width, high),
+                                   typecode, leaf_records, tmp_dir, os.path.getsize(value_path))
+            os.remove(key_path)
+            os.remove(value_path)
+
+def distribute_external(chunks, key_limit, memory_budget=DEFAULT_MEMORY_BUDGET, tmp_dir=None):
+    """
+    Kelompokkan aliran record yang lebih besar dari memori menurut kunci
+    chunks menghasilkan (keys, values): array kunci di [0, key_limit) bertipe
+    index_typecode(key_limit) (ndarray bila NumPy tersedia) dan bytes sepanjang sama
+    Menghasilkan (low, high, keys, values) untuk rentang kunci berurutan yang
+    menutup [0, key_limit), masing-masing berisi semua record dengan kunci di
+    [low, high) dalam urutan kedatangannya dan muat di memory_budget
+    Rentang yang terlalu besar dibagi ke DISTRIBUTE_FAN_OUT bucket (file kunci dan
+    file nilai di tmp_dir) lalu dibagi lagi per bucket, sehingga baca dan tulis
+    disk selalu berurutan dan file terbuka tetap sekitar 2 * DISTRIBUTE_FAN_OUT
+    berapa pun kedalamannya; satu kunci tidak pernah dipecah
+    Paling sedikit COPY_CHUNK record per rentang, sebesar satu blok baca bucket
+    """
+    leaf_records = max(COPY_CHUNK, memory_budget // DISTRIBUTE_RECORD_BYTES)
+    yield from _distribute(chunks, 0, key_limit, index_typecode(key_limit), leaf_records, tmp_dir)
+
+def chain_passes(source, target, length, rounds, one_pass, tmp_dir=None):
+    """
+    Jalankan one_pass(src, dst, length) sebanyak rounds kali dari source ke
+    target; hasil antar putaran disimpan di file sementara di tmp_dir
+    """
+    if rounds < 1:
+        shutil.copyfileobj(source, target)
+        return
+    
+    current = source
+    temps = []
+    try:
+        for round_index in range(rounds):
+            if round_index == rounds - 1:
+                destination = target
+            else:
+                destination = tempfile.TemporaryFile(dir=tmp_dir)
+                temps.append(destination)
+            one_pass(current, destination, length)
+            if destination is not target:
+                destination.seek(0)
+            current = destination
+    finally:
+        for temp in temps:
+            temp.close()
+
+class ContainerInfo:
+    __slots__ = ('cipher_id', 'params', 'chunk_size', 'chunks')
+    
+    def __init__(self, cipher_id, params, chunk_size, chunks):
+        """
+        Isi header container: id cipher, parameter (dict KEY -> VALUE string),
+        ukuran chunk dan tabel chunk [(offset, panjang, crc32)]
+        """
+        self.cipher_id = cipher_id
+        self.params = params
+        self.chunk_size = chunk_size
+        self.chunks = chunks
+    
+    @property
+    def length(self):
+        return sum(length for _, length, _ in self.chunks)
+
+def is_container_file(input_file):
+    """
+    Periksa apakah file berformat container biner
+    """
+    with open(input_file, 'rb') as f:
+        return f.read(len(CONTAINER_MAGIC)) == CONTAINER_MAGIC
+
+def read_container_info(f):
+    """
+    Baca header dan tabel chunk container dari file biner
+    """
+    fixed = f.read(CONTAINER_HEADER.size)
+    if len(fixed) != CONTAINER_HEADER.size:
+        raise ValueError("Header container tidak lengkap")
+    magic, version, id_length, params_length, chunk_size, chunk_count = CONTAINER_HEADER.unpack(fixed)
+    if magic != CONTAINER_MAGIC:
+        raise ValueError("Bukan file container")
+    if version != CONTAINER_VERSION:
+        raise ValueError(f"Versi container {version} tidak didukung")
+    
+    cipher_id = f.read(id_length).decode('utf-8')
+    params = {}
+    for line in f.read(params_length).decode('utf-8').split('\n'):
+        if ':' in line:
+            key, value = line.split(':', 1)
+            params[key] = value
+    
+    table = f.read(CONTAINER_ENTRY.size * chunk_count)
+    if len(table) != CONTAINER_ENTRY.size * chunk_count:
+        raise ValueError("Tabel chunk tidak lengkap")
+    return ContainerInfo(cipher_id, params, chunk_size, list(CONTAINER_ENTRY.iter_unpack(table)))
+
+def read_container_chunk(f, info, index, verify=True):
+    """
+    Baca satu chunk terenkripsi langsung dari posisinya; periksa CRC32 bila verify
+    """
+    offset, length, checksum = info.chunks[index]
+    f.seek(offset)
+    data = f.read(length)
+    if len(data) != length or (verify and zlib.crc32(data) != checksum):
+        raise ValueError(f"Chunk {index} rusak (CRC32 tidak cocok)")
+    return data
+
+def verify_container(input_file):
+    """
+    Periksa integritas setiap chunk tanpa dekripsi
+    Mengembalikan daftar indeks chunk yang rusak (kosong berarti utuh)
+    """
+    with open(input_file, 'rb') as f:
+        info = read_container_info(f)
+        damaged = []
+        for index in range(len(info.chunks)):
+            try:
+                read_container_chunk(f, info, index)
+            except ValueError:
+                damaged.append(index)
+    return damaged
+
+def planner_plan(planner):
+    """
+    Fungsi plan_for(panjang) dari planner (kelas cipher, argumen konstruktor, parameter plan)
+    """
+    cipher_class, args, options = planner
+    cipher = cipher_class(*args)
+    return lambda length: cipher.plan(length, **options)
+
+def _chunk_worker(task):
+    """
+    Enkripsi/dekripsi satu chunk langsung di shared memory; fungsi level
+    modul agar bisa dikirim ke process pool. Mengembalikan CRC32 hasilnya
+    planner: (kelas cipher, argumen konstruktor, parameter plan)
+    """
+    planner, name, offset, length, decrypt = task
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        view = shm.buf[offset:offset + length]
+        if length > 1:
+            plan = planner_plan(planner)(length)
+            view[:] = plan.invert(view) if decrypt else plan.apply(view)
+        checksum = zlib.crc32(view)
+        view.release()
+    finally:
+        shm.close()
+    return checksum
+
+def process_chunks(chunks, target, planner, workers, chunk_size, decrypt=False):
+    """
+    Proses chunk secara paralel: data dikirim lewat shared memory (bukan
+    pickle), paling banyak 2 * workers chunk diproses bersamaan dan hasil
+    ditulis ke target sesuai urutan
+    Mengembalikan [(offset, panjang, crc32)] untuk setiap chunk keluaran
+    """
+    slots = workers * 2
+    shm = shared_memory.SharedMemory(create=True, size=max(1, slots * chunk_size))
+    free = list(range(slots))
+    pending = deque()
+    written = []
+    
+    def finish():
+        slot, length, future = pending.popleft()
+        checksum = future.result()
+        start = slot * chunk_size
+        written.append((target.tell(), length, checksum))
+        target.write(shm.buf[start:start + length])
+        free.append(slot)
+    
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for data in chunks:
+                if not free:
+                    finish()
+                slot = free.pop()
+                start = slot * chunk_size
+                shm.buf[start:start + len(data)] = data
+                task = (planner, shm.name, start, len(data), decrypt)
+                pending.append((slot, len(data), executor.submit(_chunk_worker, task)))
+            while pending:
+                finish()
+    finally:
+        shm.close()
+        shm.unlink()
+    return written
+
+def encrypt_container(source, target, cipher_id, params, plan_for, chunk_size=CONTAINER_CHUNK_SIZE,
+                      workers=None, planner=None):
+    """
+    Tulis container: header, tabel chunk kosong, lalu setiap chunk dienkripsi
+    sendiri dengan plan_for(panjang); tabel diisi belakangan
+    workers/planner: enkripsi chunk paralel di process pool (lihat process_chunks)
+    Mengembalikan jumlah byte data
+    """
+    length = os.fstat(source.fileno()).st_size
+    chunk_count = -(-length // chunk_size)
+    cipher_id = cipher_id.encode('utf-8')
+    params = ''.join(f"{key}:{value}\n" for key, value in params.items()).encode('utf-8')
+    
+    target.write(CONTAINER_HEADER.pack(CONTAINER_MAGIC, CONTAINER_VERSION, len(cipher_id), len(params),
+                                       chunk_size, chunk_count))
+    target.write(cipher_id + params)
+    table_offset = target.tell()
+    target.write(bytes(CONTAINER_ENTRY.size * chunk_count))
+    
+    reads = (source.read(chunk_size) for _ in range(chunk_count))
+    if workers and workers > 1 and planner is not None:
+        chunks = process_chunks(reads, target, planner, workers, chunk_size)
+    else:
+        chunks = []
+        for data in reads:
+            encrypted = plan_for(len(data)).apply(data) if len(data) > 1 else data
+            chunks.append((target.tell(), len(encrypted), zlib.crc32(encrypted)))
+            target.write(encrypted)
+    
+    # Isi tabel chunk setelah offset dan CRC diketahui
+    target.seek(table_offset)
+    target.write(b''.join(CONTAINER_ENTRY.pack(*chunk) for chunk in chunks))
+    target.seek(0, os.SEEK_END)
+    return sum(length for _, length, _ in chunks)
+
+def decrypt_container(source, target, info, plan_for, workers=None, planner=None):
+    """
+    Dekripsi container chunk demi chunk (CRC32 diperiksa sebelum dekripsi)
+    workers/planner: dekripsi chunk paralel di process pool
+    """
+    if workers and workers > 1 and planner is not None:
+        reads = (read_container_chunk(source, info, index) for index in range(len(info.chunks)))
+        process_chunks(reads, target, planner, workers, max(info.chunk_size, 1), decrypt=True)
+        return info.length
+    
+    for index in range(len(info.chunks)):
+        data = read_container_chunk(source, info, index)
+        target.write(plan_for(len(data)).invert(data) if len(data) > 1 else data)
+    return info.length
+
+def encrypt_container_file(input_file, output_file, spec, workers=None):
+    """
+    Enkripsi input_file menjadi container di output_file
+    spec: (cipher_id, params header, planner, ukuran chunk) dari container_spec
+    cipher; encrypt_file(container=True) dan encrypt_batch memakai spec yang
+    sama sehingga hasilnya identik. Mengembalikan jumlah byte data
+    """
+    cipher_id, params, planner, chunk_size = spec
+    with open(input_file, 'rb') as source, open(output_file, 'wb') as target:
+        return encrypt_container(source, target, cipher_id, params, planner_plan(planner), chunk_size,
+                                 workers, planner)
+
+def decrypt_container_file(input_file, output_file, cipher_id, container_planner, workers=None):
+    """
+    Dekripsi container cipher_id di input_file ke output_file
+    container_planner(params header) memberi planner cipher; fungsi level modul
+    agar bisa dikirim ke process pool. Mengembalikan jumlah byte data
+    """
+    with open(input_file, 'rb') as source, open(output_file, 'wb') as target:
+        info = read_container_info(source)
+        if info.cipher_id != cipher_id:
+            raise ValueError(f"Container berisi cipher {info.cipher_id}, bukan {cipher_id}")
+        planner = container_planner(info.params)
+        return decrypt_container(source, target, info, planner_plan(planner), workers, planner)
+
+class BatchJob:
+    __slots__ = ('cipher_id', 'params', 'planner', 'chunk_size', 'decrypt', '_plans')
+    
+    def __init__(self, cipher_id, params, planner, chunk_size=CONTAINER_CHUNK_SIZE, decrypt=False):
+        """
+        Tugas batch per file (satu container per file) yang bisa dikirim ke process pool
+        Enkripsi: BatchJob(*spec) dari container_spec cipher
+        Dekripsi: planner adalah container_planner modul (params header -> planner)
+        """
+        self.cipher_id = cipher_id
+        self.params = params
+        self.planner = planner
+        self.chunk_size = chunk_size
+        self.decrypt = decrypt
+        self._plans = {}
+    
+    def __reduce__(self):
+        # Fungsi plan yang sudah dibuat tidak ikut dikirim ke process pool
+        return BatchJob, (self.cipher_id, self.params, self.planner, self.chunk_size, self.decrypt)
+    
+    def plan_for(self, params=None):
+        """
+        Fungsi plan_for(panjang) untuk job ini (atau untuk params header saat
+        dekripsi); cipher dibuat sekali per job/proses, bukan per file
+        """
+        key = tuple(sorted(params.items())) if params is not None else None
+        plan_for = self._plans.get(key)
+        if plan_for is None:
+            plan_for = planner_plan(self.planner(params) if self.decrypt else self.planner)
+            self._plans[key] = plan_for
+        return plan_for
+    
+    def __call__(self, paths):
+        """
+        Proses satu pasangan (file masukan, file keluaran)
+        Mengembalikan (jumlah byte, pesan error atau None)
+        """
+        input_file, output_file = paths
+        try:
+            with open(input_file, 'rb') as source, open(output_file, 'wb') as target:
+                if not self.decrypt:
+                    return encrypt_container(source, target, self.cipher_id, self.params,
+                                             self.plan_for(), self.chunk_size), None
+                info = read_container_info(source)
+                if info.cipher_id != self.cipher_id:
+                    raise ValueError(f"Container berisi cipher {info.cipher_id}, bukan {self.cipher_id}")
+                return decrypt_container(source, target, info, self.plan_for(info.params)), None
+        except Exception as e:
+            # Jangan tinggalkan file keluaran setengah jadi
+            if os.path.exists(output_file):
+                os.remove(output_file)
+            return 0, f"{input_file}: {e}"
+
+class BatchStats:
+    __slots__ = ('files', 'bytes', 'seconds', 'failures')
+    
+    def __init__(self):
+        """
+        Ringkasan hasil batch: jumlah file dan byte, durasi, daftar kegagalan
+        """
+        self.files = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.failures = []
+    
+    @property
+    def files_per_second(self):
+        return self.files / self.seconds if self.seconds else 0.0
+    
+    @property
+    def mb_per_second(self):
+        return self.bytes / (1 << 20) / self.seconds if self.seconds else 0.0
+
+def print_batch_report(stats, message, error_prefix="Error"):
+    """
+    Cetak ringkasan batch (file/s, MB/s) dan daftar file yang gagal
+    """
+    print(f"{message} ({stats.bytes:,} byte, {stats.seconds:.2f} detik, "
+          f"{stats.files_per_second:.1f} file/s, {stats.mb_per_second:.1f} MB/s)")
+    for failure in stats.failures:
+        print(f"{error_prefix}: {failure}")
+
+# Job batch milik proses worker (dipasang sekali oleh initializer process pool)
+_batch_job = None
+
+def _install_batch_job(job):
+    global _batch_job
+    _batch_job = job
+
+def _run_batch_job(paths):
+    return _batch_job(paths)
+
+def batch_files(input_dir, output_dir, job, workers=None, processes=False):
+    """
+    Jalankan job untuk setiap file di pohon input_dir dan tulis hasilnya ke
+    pohon output_dir dengan struktur yang sama
+    File diurutkan per panjang sehingga file sepanjang sama diproses berurutan
+    dan berbagi plan di cache; workers > 1 memakai thread pool (atau process pool
+    bila processes=True). Mengembalikan BatchStats
+    """
+    output_root = os.path.realpath(output_dir)
+    entries = []
+    for root, dirs, names in os.walk(input_dir):
+        # Jangan ikut memproses pohon keluaran bila berada di dalam input_dir
+        dirs[:] = sorted(d for d in dirs if os.path.realpath(os.path.join(root, d)) != output_root)
+        target_dir = os.path.normpath(os.path.join(output_dir, os.path.relpath(root, input_dir)))
+        os.makedirs(target_dir, exist_ok=True)
+        for name in names:
+            path = os.path.join(root, name)
+            entries.append((os.path.getsize(path), path, os.path.join(target_dir, name)))
+    entries.sort()
+    tasks = [(path, target) for _, path, target in entries]
+    
+    workers = workers or os.cpu_count() or 1
+    stats = BatchStats()
+    start = time.perf_counter()
+    
+    def collect(results):
+        for length, error in results:
+            if error:
+                stats.failures.append(error)
+            else:
+                stats.files += 1
+                stats.bytes += length
+    
+    if workers <= 1 or len(tasks) <= 1:
+        collect(map(job, tasks))
+    else:
+        if processes:
+            # Job dikirim sekali per proses sehingga cipher dan plan dipakai ulang antar file
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_install_batch_job, initargs=(job,))
+            function = _run_batch_job
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers)
+            function = job
+        with executor:
+            # Potongan berurutan: satu worker menerima file-file dengan panjang yang sama
+            collect(executor.map(function, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+def encrypt_batch_files(input_dir, output_dir, spec, workers=None, processes=False):
+    """
+    Enkripsi seluruh file di pohon input_dir ke pohon output_dir dengan struktur
+    sama: satu container per file (byte mentah) dari spec container_spec, dan
+    file sepanjang sama berbagi plan. Mengembalikan BatchStats
+    """
+    return batch_files(input_dir, output_dir, BatchJob(*spec), workers, processes)
+
+def decrypt_batch_files(input_dir, output_dir, cipher_id, container_planner, workers=None, processes=False):
+    """
+    Dekripsi pohon container hasil encrypt_batch_files; parameter cipher dibaca
+    dari header setiap container lewat container_planner. Mengembalikan BatchStats
+    """
+    job = BatchJob(cipher_id, None, container_planner, decrypt=True)
+    return batch_files(input_dir, output_dir, job, workers, processes)
+
+def iter_chunks(f, chunk_size=COPY_CHUNK):
+    """
+    Baca file biner (boleh pipe) per potongan sampai habis
+    """
+    return iter(lambda: f.read(chunk_size), b"")
+
+def open_stream(path, mode):
+    """
+    Buka file biner; "-" berarti stdin/stdout (tidak ditutup saat keluar dari with)
+    """
+    if path == "-":
+        stream = sys.stdin.buffer if "r" in mode else sys.stdout.buffer
+        return open(stream.fileno(), mode, closefd=False)
+    return open(path, mode)
+
+def warn_without_numpy(feature):
+    """
+    Peringatan ke stderr bila NumPy tidak ada: jalur tetap berjalan dengan
+    kernel Python murni (gather per byte, sekitar 8 MB/s)
+    """
+    if np is None:
+        print(f"Peringatan: {feature} tanpa NumPy memakai kernel Python murni yang lambat "
+              f"(pip install numpy)", file=sys.stderr)
+
+def non_negative_int(text):
+    """
+    Tipe argparse: bilangan bulat >= 0 (misalnya --rounds)
+    """
+    value = int(text)
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"harus >= 0: {text}")
+    return value
+
+def positive_int(text):
+    """
+    Tipe argparse: bilangan bulat > 0 (misalnya --frame-size, --workers)
+    """
+    value = int(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"harus > 0: {text}")
+    return value
+
+def run_cli(argv, description, add_arguments, cipher_from_args, demo, interactive_mode):
+    """
+    Titik masuk baris perintah bersama untuk semua cipher:
+    subperintah encrypt/decrypt (stdin -> stdout per frame), batch, demo dan interactive
+    Tanpa subperintah: demo lalu mode interaktif seperti sebelumnya
+    add_arguments(parser, command) mendaftarkan parameter cipher untuk subperintah
+    encrypt, decrypt atau batch; cipher_from_args(args) mengembalikan
+    (cipher, argumen tambahan encrypt_stream/decrypt_stream)
+    """
+    parser = argparse.ArgumentParser(description=description)
+    commands = parser.add_subparsers(dest="command")
+    for command, action in (("encrypt", "enkripsi"), ("decrypt", "dekripsi")):
+        sub = commands.add_parser(command, help=f"{action} stdin/file ke stdout/file per frame (tanpa header)")
+        add_arguments(sub, command)
+        sub.add_argument("-i", "--input", default="-", help="file masukan (default stdin)")
+        sub.add_argument("-o", "--output", default="-", help="file keluaran (default stdout)")
+        sub.add_argument("--frame-size", type=positive_int, default=None,
+                         help="ukuran frame; dekripsi harus memakai nilai yang sama")
+    batch = commands.add_parser("batch", help="enkripsi/dekripsi seluruh pohon direktori (satu container per file)")
+    add_arguments(batch, "batch")
+    batch.add_argument("input_dir", help="direktori masukan")
+    batch.add_argument("output_dir", help="direktori keluaran (struktur sama dengan masukan)")
+    batch.add_argument("-d", "--decrypt", action="store_true", help="dekripsi container (parameter dari header)")
+    batch.add_argument("-w", "--workers", type=positive_int, default=None, help="jumlah worker (default jumlah CPU)")
+    batch.add_argument("--processes", action="store_true", help="pakai process pool, bukan thread pool")
+    commands.add_parser("demo", help="jalankan demonstrasi")
+    commands.add_parser("interactive", help="mode interaktif")
+    args = parser.parse_args(argv)
+    
+    if args.command is None:
+        demo()
+        interactive_mode()
+        return 0
+    if args.command == "demo":
+        demo()
+        return 0
+    if args.command == "interactive":
+        interactive_mode()
+        return 0
+    
+    if args.command == "batch":
+        if not os.path.isdir(args.input_dir):
+            print(f"Error: {args.input_dir} bukan direktori", file=sys.stderr)
+            return 1
+        cipher, options = cipher_from_args(args)
+        if args.decrypt:
+            stats = cipher.decrypt_batch(args.input_dir, args.output_dir, args.workers, args.processes)
+        else:
+            stats = cipher.encrypt_batch(args.input_dir, args.output_dir, workers=args.workers,
+                                         processes=args.processes, **options)
+        return 1 if stats.failures else 0
+    
+    cipher, options = cipher_from_args(args)
+    stream = cipher.encrypt_stream if args.command == "encrypt" else cipher.decrypt_stream
+    try:
+        with open_stream(args.input, "rb") as source, open_stream(args.output, "wb") as target:
+            for frame in stream(iter_chunks(source), **options):
+                target.write(frame)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # Pembaca berhenti lebih awal (mis. | head); jangan cetak traceback saat flush terakhir
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    return 0
@@ -1,12 +1,94 @@
+import math
 import os
+from array import array
+
+from polaplan import (CONTAINER_CHUNK_SIZE, COPY_CHUNK, DEFAULT_FRAME_SIZE, FilePlan, check_rounds,
+                      compile_plan, copy_pieces, decrypt_batch_files, decrypt_container_file,
+                      encrypt_batch_files, encrypt_container_file, index_dtype, index_typecode,
+                      is_container_file, iter_frames, non_negative_int, np, permute_file,
+                      permute_inplace_pieces, plan_power, print_batch_report, read_header_fields, run_cli,
+                      stream_frames, warn_without_numpy)
+
+class StaircaseGrid:
+    def __init__(self, text, rows, width):
+        """
+        Tampilan grid tangga yang dibangun per baris saat dibaca
+        (untuk visualisasi, tanpa menyimpan grid width x width)
+        """
+        self.text = text
+        self.rows = rows
+        self.width = width
+    
+    def __len__(self):
+        return self.width
+    
+    def __getitem__(self, row):
+        if row < 0:
+            row += self.width
+        if not 0 <= row < self.width:
+            raise IndexError("baris di luar grid")
+        
+        cells = [' '] * self.width
+        if row < len(self.rows):
+            start, count = self.rows[row]
+            cells[row:row + count] = self.text[start:start + count]
+        return cells
 
 class StaircaseCipher:
-    def __init__(self, step_size=3):
+    def __init__(self, step_size=3, rounds=1):
         """
         Inisialisasi cipher dengan ukuran langkah tangga
         step_size: jumlah karakter per langkah tangga (default 3)
+        rounds: jumlah putaran enkripsi pembacaan kolom (default 1)
         """
         self.step_size = step_size
+        self.rounds = check_rounds(rounds)
+    
+    def level_start(self, level):
+        """
+        Offset awal level ke-level (dimulai dari 0) dalam bentuk tertutup:
+        ukuran level step_size, step_size + 1, ... sehingga awalnya adalah
+        level * step_size + bilangan segitiga level * (level - 1) / 2
+        """
+        return level * self.step_size + level * (level - 1) // 2
+    
+    def level_span(self, level, length=None):
+        """
+        Rentang (start, stop) level ke-level; dipotong ke length bila diberikan
+        """
+        start = self.level_start(level)
+        stop = start + self.step_size + level
+        if length is not None:
+            start, stop = min(start, length), min(stop, length)
+        return start, stop
+    
+    def level_at(self, offset):
+        """
+        Nomor level yang memuat offset, dihitung langsung dengan akar kuadrat
+        """
+        # Akar positif dari level^2 + (2 * step_size - 1) * level - 2 * offset = 0
+        b = 2 * self.step_size - 1
+        level = max((math.isqrt(b * b + 8 * offset) - b) // 2, 0)
+        
+        # Koreksi pembulatan akar bilangan bulat
+        while self.level_start(level + 1) <= offset:
+            level += 1
+        while level > 0 and self.level_start(level) > offset:
+            level -= 1
+        return level
+    
+    def level_count(self, length):
+        """
+        Jumlah level untuk teks sepanjang length
+        """
+        return self.level_at(length - 1) + 1 if length > 0 else 0
+    
+    def split_levels(self, text):
+        """
+        Potong teks menjadi level-level tangga tanpa menelusuri level satu per satu
+        """
+        return [text[slice(*self.level_span(level, len(text)))]
+                for level in range(self.level_count(len(text)))]
     
     def encrypt_text(self, plaintext):
         """
@@ -18,24 +100,9 @@ class StaircaseCipher:
         # Hilangkan spasi dan ubah ke uppercase
         text = plaintext.replace(" ", "").upper()
         
-        # Buat struktur tangga
-        stairs = []
-        current_pos = 0
-        stair_level = 0
-        
-        while current_pos < len(text):
-            # Hitung jumlah karakter untuk level tangga ini
-            chars_in_level = min(self.step_size + stair_level, len(text) - current_pos)
-            
-            # Ambil karakter untuk level ini
-            level_chars = text[current_pos:current_pos + chars_in_level]
-            stairs.append(level_chars)
-            
-            current_pos += chars_in_level
-            stair_level += 1
-        
-        # Gabungkan semua level untuk mendapatkan ciphertext
-        ciphertext = ''.join(stairs)
+        # Level-level tangga disambung berurutan, jadi ciphertext = teks
+        stairs = self.split_levels(text)
+        ciphertext = text
         
         return ciphertext, stairs
     
@@ -46,26 +113,198 @@ class StaircaseCipher:
         if len(ciphertext) <= 1:
             return ciphertext
         
-        # Rekonstruksi struktur tangga
-        stairs = []
-        current_pos = 0
-        stair_level = 0
-        
-        while current_pos < len(ciphertext):
-            # Hitung jumlah karakter untuk level tangga ini
-            chars_in_level = min(self.step_size + stair_level, len(ciphertext) - current_pos)
-            
-            # Ambil karakter untuk level ini
-            level_chars = ciphertext[current_pos:current_pos + chars_in_level]
-            stairs.append(level_chars)
-            
-            current_pos += chars_in_level
-            stair_level += 1
+        # Level disusun berurutan sehingga plaintext sama dengan gabungan level
+        return ciphertext
+    
+    def read_header(self, f):
+        """
+        Baca header metadata file biner dan atur step_size
+        Mengembalikan (metode, panjang asli, panjang header dalam byte)
+        """
+        method = "simple"
+        original_length = None
+        header_length = 0
+        while True:
+            line = f.readline()
+            header_length += len(line)
+            if not line:
+                raise ValueError("Format file tidak valid")
+            line = line.decode('utf-8').rstrip('\n')
+            if line == '---':
+                break
+            if line.startswith("METHOD:"):
+                method = line.split(":")[1]
+            elif line.startswith("STEP_SIZE:"):
+                self.step_size = int(line.split(":")[1])
+            elif line.startswith("ORIGINAL_LENGTH:"):
+                original_length = int(line.split(":")[1])
+        
+        return method, original_length, header_length
+    
+    def _open_levels(self, input_file):
+        """
+        Buka file tangga metode simple dan kembalikan (file, offset payload, panjang payload)
+        """
+        f = open(input_file, 'rb')
+        try:
+            method, _, header_length = self.read_header(f)
+            if method != "simple":
+                raise ValueError("Indeks level hanya berlaku untuk metode simple")
+            length = os.fstat(f.fileno()).st_size - header_length
+        except Exception:
+            f.close()
+            raise
+        return f, header_length, length
+    
+    def iter_levels(self, input_file, offset=0):
+        """
+        Iterasi level secara lazy mulai dari level yang memuat offset payload
+        Menghasilkan (nomor level, bytes level); offset dalam byte
+        """
+        f, header_length, length = self._open_levels(input_file)
+        with f:
+            if offset >= length:
+                return
+            level = self.level_at(offset)
+            start, stop = self.level_span(level, length)
+            f.seek(header_length + start)
+            while start < length:
+                yield level, f.read(stop - start)
+                level += 1
+                start, stop = self.level_span(level, length)
+    
+    def read_levels(self, input_file, first, last):
+        """
+        Ambil level [first, last) langsung dari file tangga besar dengan satu seek
+        Mengembalikan daftar bytes per level
+        """
+        f, header_length, length = self._open_levels(input_file)
+        with f:
+            start = self.level_span(first, length)[0]
+            stop = self.level_span(max(last - 1, first), length)[1] if last > first else start
+            f.seek(header_length + start)
+            data = f.read(stop - start)
+        
+        return [data[level_start - start:level_stop - start]
+                for level_start, level_stop in (self.level_span(level, length) for level in range(first, last))
+                if level_start < level_stop]
+    
+    def column_layout(self, length):
+        """
+        Hitung tata letak grid tangga untuk pembacaan kolom tanpa membuat grid
+        Mengembalikan (max_width, [(indeks awal, jumlah karakter) per baris]);
+        baris ke-r menempati kolom r sampai r + jumlah - 1
+        """
+        max_width = self.step_size + (length // self.step_size)
+        rows = []
+        char_index = 0
+        row = 0
         
-        # Gabungkan kembali untuk mendapatkan plaintext
-        plaintext = ''.join(stairs)
+        while char_index < length and row < max_width:
+            chars_in_row = min(self.step_size + row, length - char_index, max_width - row)
+            rows.append((char_index, chars_in_row))
+            char_index += chars_in_row
+            row += 1
         
-        return plaintext
+        return max_width, rows
+    
+    def column_table(self, length):
+        """
+        Tabel ringkas pembacaan kolom, O(jumlah baris + jumlah kolom):
+        bases[r] = awal baris r dikurangi r, sehingga sel (r, c) berisi
+        plaintext[bases[r] + c]; columns = [(c, low, high)] baris yang
+        menempati kolom c selalu berurutan dari low sampai high
+        """
+        _, rows = self.column_layout(length)
+        bases = array('q', (start - row for row, (start, _) in enumerate(rows)))
+        columns = []
+        if not rows:
+            return bases, columns
+        
+        ends = [row + count for row, (_, count) in enumerate(rows)]
+        last = len(rows) - 1
+        low = 0
+        for col in range(max(ends)):
+            while low < last and ends[low] <= col:
+                low += 1
+            high = min(col, last)
+            if high == last and ends[last] <= col:
+                high -= 1
+            if low <= high:
+                columns.append((col, low, high))
+        return bases, columns
+    
+    def column_pieces(self, length, piece_size=COPY_CHUNK):
+        """
+        Permutasi pembacaan kolom per potongan (posisi, indeks sumber)
+        sekitar piece_size indeks, tanpa membangun urutan lengkap
+        """
+        bases, columns = self.column_table(length)
+        if np is not None:
+            bases = np.frombuffer(bases, dtype=np.int64).astype(index_dtype(length))
+        position = 0
+        parts = []
+        count = 0
+        for col, low, high in columns:
+            parts.append(bases[low:high + 1] + col if np is not None else map(col.__add__, bases[low:high + 1]))
+            count += high - low + 1
+            if count >= piece_size:
+                yield position, self._join_pieces(parts, length)
+                position += count
+                parts, count = [], 0
+        if parts:
+            yield position, self._join_pieces(parts, length)
+    
+    @staticmethod
+    def _join_pieces(parts, length):
+        if np is not None:
+            return np.concatenate(parts)
+        piece = array(index_typecode(length))
+        for part in parts:
+            piece.extend(part)
+        return piece
+    
+    def build_column_order(self, length):
+        """
+        Bangun permutasi pembacaan kolom dalam O(n):
+        ciphertext[k] = plaintext[order[k]]
+        """
+        if np is not None:
+            order = np.empty(length, dtype=index_dtype(length))
+        else:
+            order = array(index_typecode(length), [0]) * length
+        end = 0
+        for position, piece in self.column_pieces(length):
+            end = position + len(piece)
+            order[position:end] = piece
+        return order[:end]
+    
+    def file_plan(self, length, method="simple"):
+        """
+        Plan mode mmap: pembacaan kolom disalin per potongan kolom tanpa array
+        indeks penuh; "simple" tidak memindahkan byte (None = salin apa adanya)
+        """
+        if method != "column":
+            return None
+        copy_pass = lambda source, target, decrypt: copy_pieces(self.column_pieces(length), source, target, decrypt)
+        return FilePlan(length, copy_pass, self.rounds)
+    
+    def column_plan(self, length):
+        """
+        Ambil TranspositionPlan pembacaan kolom dari cache
+        untuk (step_size, length)
+        """
+        key = ('staircase_column', self.step_size, length)
+        return compile_plan(key, lambda: self.build_column_order(length))
+    
+    def plan(self, length, method="simple"):
+        """
+        TranspositionPlan untuk metode enkripsi tertentu
+        "simple" tidak memindahkan karakter (identitas), "column" membaca kolom
+        """
+        if method == "column":
+            return plan_power(self.column_plan(length), self.rounds)
+        return compile_plan(('staircase_simple', length), lambda: range(length))
     
     def encrypt_text_column_read(self, plaintext):
         """
@@ -78,77 +317,81 @@ class StaircaseCipher:
         # Hilangkan spasi dan ubah ke uppercase
         text = plaintext.replace(" ", "").upper()
         
-        # Buat grid tangga
-        max_width = self.step_size + (len(text) // self.step_size)
-        grid = [[' ' for _ in range(max_width)] for _ in range(max_width)]
-        
-        # Isi grid dengan pola tangga
-        char_index = 0
-        row = 0
-        
-        while char_index < len(text) and row < max_width:
-            # Jumlah karakter untuk baris ini
-            chars_in_row = min(self.step_size + row, len(text) - char_index, max_width - row)
-            
-            # Isi baris mulai dari kolom = row
-            for col in range(row, row + chars_in_row):
-                if char_index < len(text) and col < max_width:
-                    grid[row][col] = text[char_index]
-                    char_index += 1
-            
-            row += 1
-        
-        # Baca kolom demi kolom untuk enkripsi
-        ciphertext = ""
-        for col in range(max_width):
-            for row in range(max_width):
-                if grid[row][col] != ' ':
-                    ciphertext += grid[row][col]
+        # Baca kolom demi kolom lewat permutasi, tanpa grid max_width x max_width
+        ciphertext = self.plan(len(text), "column").apply(text)
         
-        return ciphertext, grid
+        max_width, rows = self.column_layout(len(text))
+        return ciphertext, StaircaseGrid(text, rows, max_width)
     
-    def decrypt_text_column_read(self, ciphertext, original_length):
+    def decrypt_text_column_read(self, ciphertext, original_length=None):
         """
         Dekripsi dari pola tangga dengan pembacaan kolom
+        Memakai permutasi invers yang sama persis dengan enkripsi (waktu linear);
+        panjang grid diambil dari ciphertext, original_length hanya untuk
+        kompatibilitas
         """
         if len(ciphertext) <= 1:
             return ciphertext
         
-        # Tentukan ukuran grid
-        max_width = self.step_size + (original_length // self.step_size) + 1
-        grid = [[' ' for _ in range(max_width)] for _ in range(max_width)]
-        
-        # Tentukan posisi yang valid dalam pola tangga
-        valid_positions = []
-        row = 0
-        char_count = 0
-        
-        while char_count < original_length and row < max_width:
-            chars_in_row = min(self.step_size + row, original_length - char_count, max_width - row)
-            
-            for col in range(row, row + chars_in_row):
-                if col < max_width:
-                    valid_positions.append((row, col))
-                    char_count += 1
-            
-            row += 1
-        
-        # Isi grid berdasarkan urutan kolom
-        cipher_index = 0
-        for col in range(max_width):
-            for row in range(max_width):
-                if (row, col) in valid_positions and cipher_index < len(ciphertext):
-                    grid[row][col] = ciphertext[cipher_index]
-                    cipher_index += 1
-        
-        # Baca kembali sesuai pola tangga
-        plaintext = ""
-        for row in range(max_width):
-            for col in range(row, max_width):
-                if grid[row][col] != ' ':
-                    plaintext += grid[row][col]
-        
-        return plaintext
+        return self.plan(len(ciphertext), "column").invert(ciphertext)
+    
+    def encrypt_inplace(self, buffer, method="simple"):
+        """
+        Enkripsi langsung di bytearray/mmap yang bisa ditulis, tanpa normalisasi
+        (metode "simple" tidak mengubah urutan); urutan kolom ditulis per
+        potongan column_pieces ke mmap sementara, bukan heap
+        """
+        if method == "simple" or len(buffer) <= 1:
+            return buffer
+        return permute_inplace_pieces(buffer, self.column_pieces(len(buffer)), self.rounds)
+    
+    def decrypt_inplace(self, buffer, method="simple"):
+        """
+        Dekripsi langsung di bytearray/mmap yang bisa ditulis
+        """
+        if method == "simple" or len(buffer) <= 1:
+            return buffer
+        return permute_inplace_pieces(buffer, self.column_pieces(len(buffer)), self.rounds, decrypt=True)
+    
+    def encrypt_stream(self, chunks, method="simple", frame_size=DEFAULT_FRAME_SIZE):
+        """
+        Enkripsi aliran potongan bytes per frame berukuran tetap, tanpa normalisasi;
+        setiap frame dihasilkan begitu lengkap (buffer paling banyak satu frame)
+        """
+        if method == "simple":
+            return iter_frames(chunks, frame_size)
+        return stream_frames(chunks, frame_size, lambda length: self.plan(length, method))
+    
+    def decrypt_stream(self, chunks, method="simple", frame_size=DEFAULT_FRAME_SIZE):
+        """
+        Dekripsi aliran potongan bytes hasil encrypt_stream dengan ukuran frame yang sama
+        """
+        if method == "simple":
+            return iter_frames(chunks, frame_size)
+        return stream_frames(chunks, frame_size, lambda length: self.plan(length, method), decrypt=True)
+    
+    def container_spec(self, method="simple"):
+        """
+        Spec container StaircaseCipher: parameter tangga dan metode plan di header
+        """
+        params = {'METHOD': method, 'STEP_SIZE': self.step_size, 'ROUNDS': self.rounds}
+        return 'staircase', params, container_planner(params), CONTAINER_CHUNK_SIZE
+    
+    def encrypt_batch(self, input_dir, output_dir, method="simple", workers=None, processes=False):
+        """
+        Enkripsi pohon input_dir ke output_dir, satu container tangga per file (metode method). Mengembalikan BatchStats
+        """
+        stats = encrypt_batch_files(input_dir, output_dir, self.container_spec(method), workers, processes)
+        print_batch_report(stats, f"Batch enkripsi: {stats.files} file")
+        return stats
+    
+    def decrypt_batch(self, input_dir, output_dir, workers=None, processes=False):
+        """
+        Dekripsi pohon container tangga hasil encrypt_batch. Mengembalikan BatchStats
+        """
+        stats = decrypt_batch_files(input_dir, output_dir, 'staircase', container_planner, workers, processes)
+        print_batch_report(stats, f"Batch dekripsi: {stats.files} file")
+        return stats
     
     def visualize_staircase_pattern(self, text, stairs):
         """
@@ -181,12 +424,36 @@ class StaircaseCipher:
             if any(cell != ' ' for cell in row):  # Hanya tampilkan baris yang tidak kosong
                 print(f"Baris {i+1}: {row_str}")
     
-    def encrypt_file(self, input_file, output_file, method="simple"):
+    def encrypt_file(self, input_file, output_file, method="simple", use_mmap=False, container=False,
+                     workers=None):
         """
         Enkripsi file teks
         method: "simple" atau "column" untuk metode yang berbeda
+        use_mmap: transposisi byte mentah lewat mmap tanpa decode/normalisasi;
+        mengembalikan jumlah byte
+        container: tulis container biner bersama (chunk + CRC32, byte mentah);
+        mengembalikan jumlah byte
+        workers: enkripsi chunk container secara paralel (workers > 1 memakai container)
         """
         try:
+            if container or (workers and workers > 1):
+                total = encrypt_container_file(input_file, output_file, self.container_spec(method), workers)
+                
+                print(f"File berhasil dienkripsi (container): {input_file} -> {output_file}")
+                return total
+            
+            if use_mmap:
+                length = os.path.getsize(input_file)
+                metadata = f"METHOD:{method}\nSTEP_SIZE:{self.step_size}\nORIGINAL_LENGTH:{length}\n"
+                if method == "column" and self.rounds != 1:
+                    metadata += f"ROUNDS:{self.rounds}\n"
+                metadata += "UNIT:bytes\n---\n"
+                total = permute_file(input_file, output_file, lambda n: self.file_plan(n, method),
+                                     metadata.encode('utf-8'))
+                
+                print(f"File berhasil dienkripsi (mmap): {input_file} -> {output_file}")
+                return total
+            
             with open(input_file, 'r', encoding='utf-8') as f:
                 content = f.read()
             
@@ -195,7 +462,10 @@ class StaircaseCipher:
                 metadata = f"METHOD:simple\nSTEP_SIZE:{self.step_size}\nORIGINAL_LENGTH:{len(content.replace(' ', ''))}\n---\n"
             else:
                 encrypted, grid = self.encrypt_text_column_read(content)
-                metadata = f"METHOD:column\nSTEP_SIZE:{self.step_size}\nORIGINAL_LENGTH:{len(content.replace(' ', ''))}\n---\n"
+                metadata = f"METHOD:column\nSTEP_SIZE:{self.step_size}\nORIGINAL_LENGTH:{len(content.replace(' ', ''))}\n"
+                if self.rounds != 1:
+                    metadata += f"ROUNDS:{self.rounds}\n"
+                metadata += "---\n"
             
             with open(output_file, 'w', encoding='utf-8') as f:
                 f.write(metadata + encrypted)
@@ -210,11 +480,32 @@ class StaircaseCipher:
             print(f"Error saat enkripsi: {e}")
             return None
     
-    def decrypt_file(self, input_file, output_file):
+    def decrypt_file(self, input_file, output_file, use_mmap=False, workers=None):
         """
         Dekripsi file teks
+        File hasil mode mmap (UNIT:bytes) dan container dikenali otomatis
+        workers: dekripsi chunk container secara paralel
         """
         try:
+            if is_container_file(input_file):
+                total = decrypt_container_file(input_file, output_file, 'staircase', container_planner, workers)
+                
+                print(f"File berhasil didekripsi (container): {input_file} -> {output_file}")
+                return total
+            
+            with open(input_file, 'rb') as f:
+                _, fields, header_length = read_header_fields(f)
+            
+            if use_mmap or fields.get('UNIT') == 'bytes':
+                method = fields.get('METHOD', "simple")
+                self.step_size = int(fields.get('STEP_SIZE', self.step_size))
+                self.rounds = check_rounds(int(fields.get('ROUNDS', 1)))
+                total = permute_file(input_file, output_file, lambda n: self.file_plan(n, method),
+                                     offset=header_length, decrypt=True)
+                
+                print(f"File berhasil didekripsi (mmap): {input_file} -> {output_file}")
+                return total
+            
             with open(input_file, 'r', encoding='utf-8') as f:
                 content = f.read()
             
@@ -229,14 +520,18 @@ class StaircaseCipher:
             # Extract metadata
             method = "simple"
             original_length = len(encrypted_content)
+            rounds = 1
             
             for line in metadata_lines:
                 if line.startswith("METHOD:"):
                     method = line.split(":")[1]
+                elif line.startswith("ROUNDS:"):
+                    rounds = int(line.split(":")[1])
                 elif line.startswith("STEP_SIZE:"):
                     self.step_size = int(line.split(":")[1])
                 elif line.startswith("ORIGINAL_LENGTH:"):
                     original_length = int(line.split(":")[1])
+            self.rounds = check_rounds(rounds)
             
             # Dekripsi sesuai metode
             if method == "simple":
@@ -257,6 +552,13 @@ class StaircaseCipher:
             print(f"Error saat dekripsi: {e}")
             return None
 
+def container_planner(params):
+    """
+    Planner StaircaseCipher dari header container (parameter tangga dan METHOD)
+    """
+    return (StaircaseCipher, (int(params['STEP_SIZE']), int(params.get('ROUNDS', 1))),
+            {'method': params.get('METHOD', "simple")})
+
 def demo():
     """
     Demonstrasi penggunaan StaircaseCipher
@@ -404,9 +706,33 @@ def interactive_mode():
         else:
             print("Pilihan tidak valid!")
 
+def add_cli_arguments(parser, command):
+    """
+    Parameter cipher untuk baris perintah (sama untuk semua subperintah)
+    """
+    parser.add_argument("--step-size", type=int, default=3, help="karakter per langkah tangga (default 3)")
+    parser.add_argument("--rounds", type=non_negative_int, default=1, help="jumlah putaran metode column (default 1)")
+    parser.add_argument("--method", choices=("simple", "column"), default="simple",
+                        help="metode enkripsi (default simple)")
+
+def cipher_from_args(args):
+    """
+    Bangun cipher dan argumen stream (atau argumen encrypt_batch) dari argumen baris perintah
+    Tanpa NumPy stream metode column memakai kernel Python murni (dengan peringatan)
+    """
+    options = {'method': args.method}
+    if args.command != "batch":
+        if args.method == "column":
+            warn_without_numpy("Stream metode column")
+        options['frame_size'] = args.frame_size or DEFAULT_FRAME_SIZE
+    return StaircaseCipher(args.step_size, args.rounds), options
+
+def main(argv=None):
+    """
+    Titik masuk baris perintah StaircaseCipher
+    """
+    return run_cli(argv, "Staircase Cipher (pola tangga)", add_cli_arguments, cipher_from_args, demo, interactive_mode)
+
 if __name__ == "__main__":
-    # Jalankan demo
-    demo()
-    
-    # Jalankan mode interaktif
-    interactive_mode()
\ No newline at end of file
+    # Tanpa argumen: demo lalu mode interaktif
+    raise SystemExit(main())